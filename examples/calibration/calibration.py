@@ -146,9 +146,9 @@ def cali_helper():
                 angle_b = POSITIVE_LIST[_index][1] * (ANGLE_ZERO[0]+ angle_offset[_index*3 + 1])
                 angle_c = POSITIVE_LIST[_index][2] * (ANGLE_ZERO[2]+ angle_offset[_index*3 + 2])
 
-                crawler.servo_list[_index*3 + 0].angle(angle_a)
-                crawler.servo_list[_index*3 + 1].angle(angle_b)
-                crawler.servo_list[_index*3 + 2].angle(angle_c)
+                crawler.servo_write(_index*3 + 0, angle_a)
+                crawler.servo_write(_index*3 + 1, angle_b)
+                crawler.servo_write(_index*3 + 2, angle_c)
 
                 show_info()
         elif key == readchar.key.SPACE:
@@ -5,9 +5,12 @@ import sys
 import tty
 import termios
 import copy
+import os
 
 crawler = Picrawler() 
 speed = 80
+# the last playback of the saved steps, replayed by 'o'
+recording = 'new_step.pcr'
 
 def readchar():
     fd = sys.stdin.fileno()
@@ -33,7 +36,8 @@ Press keys on keyboard to control!
     3: Select left rear leg
     4: Select right rear leg
     Space: Print all leg coodinate & Save this step
-    p: Play all saved step
+    p: Play all saved step (recorded to new_step.pcr)
+    o: Replay the recording twice as fast
     esc: Quit
 '''
 
@@ -45,9 +49,17 @@ def save_new_step():
     print(new_step)
 
 def play_all_new_step():
+    if os.path.exists(recording):
+        os.remove(recording)
+    crawler.start_recording(recording)
     for step in new_step:
         crawler.do_step(step,speed)
         sleep(0.6)
+    crawler.stop_recording()
+
+def replay_recording():
+    if os.path.exists(recording):
+        crawler.play_recording(recording, speed=2.0)
 
 def main():  
 
@@ -91,6 +103,8 @@ def main():
             save_new_step()
         elif 'p' == key:
             play_all_new_step()
+        elif 'o' == key:
+            replay_recording()
         elif chr(27) == key:# 27 for ESC
             break    
 
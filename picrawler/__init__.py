@@ -1,2 +1,3 @@
 from .picrawler import Picrawler
+from .async_picrawler import AsyncPicrawler
 from .version import __version__
\ No newline at end of file
@@ -0,0 +1,91 @@
+def normalize(name):
+    # 'Turn left', 'turn_left' and 'turn-left' are the same action
+    return name.strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def failed(error):
+    # loader of a LAZY entry whose load raised error
+    def load():
+        raise error
+    return load
+
+
+class ActionRegistry(object):
+    '''
+    One table for every action Picrawler can run by name.
+
+    kinds:
+        GAIT     - a MoveList gait, action is the MoveList property name
+        STEPS    - a list of steps (coordinates) passed to do_step one by one
+        FUNCTION - a callable taking the Picrawler, like the actions_dict
+                   entries in preset_actions.py
+        COMPILED - solved steps, (angles, coords, limit_flags, state) like
+                   Picrawler.compile_action returns
+        LAZY     - a loader returning (kind, action), called the first time
+                   the action is looked up, the entry is then replaced by
+                   what it returned (plugins.py), or by a loader raising
+                   the same error again if it failed
+    '''
+    GAIT = 'gait'
+    STEPS = 'steps'
+    FUNCTION = 'function'
+    COMPILED = 'compiled'
+    LAZY = 'lazy'
+
+    def __init__(self):
+        self.actions = {}  # normalized name -> (kind, action)
+        self.aliases = {}  # name as registered / looked up -> normalized name
+
+    def register(self, name, kind, action, override=True):
+        key = normalize(name)
+        if not override and key in self.actions:
+            return False
+        self.actions[key] = (kind, action)
+        self.aliases[name] = key
+        return True
+
+    def register_steps(self, table, override=True):
+        for name, steps in table.items():
+            if steps is not None:
+                self.register(name, self.STEPS, steps, override)
+
+    def register_functions(self, table, override=False):
+        for name, func in table.items():
+            if func is not None:
+                self.register(name, self.FUNCTION, func, override)
+
+    def register_lazy(self, name, loader, override=False):
+        return self.register(name, self.LAZY, loader, override)
+
+    def get(self, name):
+        key = self.aliases.get(name)
+        if key is None:
+            key = normalize(name)
+            if key in self.actions:
+                self.aliases[name] = key
+        entry = self.actions.get(key)
+        if entry is not None and entry[0] == self.LAZY:
+            try:
+                entry = entry[1]()
+            except Exception as error:
+                # kept, running the action raises it again without retrying the load
+                self.actions[key] = (self.LAZY, failed(error))
+                raise
+            self.actions[key] = entry
+        return entry
+
+    def unregister(self, name):
+        key = normalize(name)
+        self.actions.pop(key, None)
+        for alias in [alias for alias, _key in self.aliases.items() if _key == key]:
+            del self.aliases[alias]
+
+    def names(self, kind=None):
+        return [name for name, (_kind, _) in self.actions.items() if kind is None or _kind == kind]
+
+    def __contains__(self, name):
+        # names only, a LAZY entry is not loaded
+        return name in self.aliases or normalize(name) in self.actions
+
+    def __len__(self):
+        return len(self.actions)
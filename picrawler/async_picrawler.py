@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+from .actions import ActionRegistry
+from .backend import STEP_TIME, MAX_DPS, move_steps
+from .picrawler import Picrawler
+
+
+class AsyncPicrawler(object):
+    '''
+    asyncio front end of Picrawler. Frames are interpolated and written from
+    the event loop itself, with await asyncio.sleep() between servo updates,
+    so a motion shares the loop with sensing and can be cancelled like any
+    other task: the legs stop at the next servo update.
+
+    Preset functions (actions_dict style, which call the blocking do_step
+    themselves) run on the Picrawler's motion executor thread and are
+    cancelled through it at the next frame.
+
+    Everything not defined here is passed through to the Picrawler, e.g.
+    crawler.current_step_all_leg_value().
+    '''
+    STEP_TIME = STEP_TIME
+
+    def __init__(self, spider=None, **kwargs):
+        self.spider = spider if spider is not None else Picrawler(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.spider, name)
+
+    async def servo_move(self, targets, speed=50, bpm=None):
+        '''
+        robot_hat Robot.servo_move, with the waiting done by the event loop
+        '''
+        spider = self.spider
+        positions = spider.servo_positions
+        delta = [targets[i] - positions[i] for i in range(len(targets))]
+        max_step = move_steps(delta, speed, bpm, getattr(spider, 'max_dps', MAX_DPS))
+        if max_step == 0:
+            await asyncio.sleep(self.STEP_TIME/1000)
+            return
+        steps = [d / max_step for d in delta]
+
+        deadline = time.perf_counter()
+        for _ in range(max_step):
+            positions = [positions[i] + steps[i] for i in range(len(steps))]
+            spider.servo_write_all(positions)
+            spider.servo_positions = positions
+            deadline += self.STEP_TIME/1000
+            await asyncio.sleep(max(0, deadline - time.perf_counter()))
+
+    async def move_frame(self, angles, coord, speed=50, limit=0):
+        self.spider.state.set_coords(coord)
+        self.spider.state.set_angles(angles)
+        self.spider.record_frame(coord, angles, speed, limit)
+        await self.servo_move(angles, speed)
+
+    async def frames(self, motion_name, step=1):
+        '''
+        Async iterator over the frames of an action, (angles, coords) per
+        frame with angles ready for servo_move, solved the way do_action
+        would, one at a time as they are consumed (Picrawler.stream_action).
+        '''
+        for angles, coords, _ in self.spider.stream_action(motion_name, step):
+            yield angles.tolist(), coords.tolist()
+
+    async def do_action(self, motion_name, step=1, speed=50):
+        entry = self.spider.actions.get(motion_name)
+        if entry is None:
+            print("No such action")
+            return
+        kind, action = entry
+        if kind == ActionRegistry.FUNCTION:
+            for _ in range(step):
+                await self.run(action)
+            return
+        async for angles, coord in self.frames(motion_name, step):
+            await self.move_frame(angles, coord, speed)
+
+    async def do_step(self, _step, speed=50, israise=False):
+        if isinstance(_step, str):
+            if _step not in self.spider.step_list:
+                print("The name of gait is not in the default gait dictionary")
+                return
+            steps = self.spider.step_list[_step]
+        elif isinstance(_step, list):
+            steps = [_step]
+        else:
+            print("The \"_step\" parameter is wrong.")
+            return
+        angles, coords, flags = self.spider.solve_steps(steps)
+        for i in range(len(angles)):
+            if flags[i] and israise == True:
+                raise ValueError('\033[1;35mCoordinates out of controllable range.\033[0m')
+            await self.move_frame(angles[i].tolist(), coords[i].tolist(), speed, flags[i])
+
+    async def run(self, func, *args, **kwargs):
+        '''
+        Run a blocking function taking the Picrawler on the motion executor
+        thread, cancelling the task cancels the motion.
+        '''
+        future = self.spider.submit(func, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.spider.cancel(future)
+            raise
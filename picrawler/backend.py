@@ -0,0 +1,257 @@
+'''
+Simulated Robot HAT, so Picrawler runs without a Raspberry Pi.
+
+    crawler = Picrawler(backend='sim')
+    PICRAWLER_BACKEND=sim python3 move.py
+
+The simulation replaces the servos and the I2C bus under robot_hat's Robot:
+every PWM write is recorded on a SimBus with a latency per transaction, and
+every SimServo follows its command at a limited slew rate. A frame can go
+out as block writes over contiguous channels (write_servos) instead of one
+transaction per servo, batch=False simulates a bus without them. Block
+writes exist in the simulation only, on the Robot HAT Picrawler writes one
+servo per transaction (see Picrawler.servo_write_raw). Time is virtual
+by default, servo_move and the bus latency advance SimBackend.clock instead
+of sleeping, so benchmarks run as fast as the CPU allows. With
+realtime=True they really sleep.
+'''
+import time
+
+# robot_hat Robot.servo_move: interpolation step in ms, default servo speed limit
+STEP_TIME = 10
+MAX_DPS = 428
+
+
+def move_steps(delta, speed=50, bpm=None, max_dps=MAX_DPS):
+    '''
+    How robot_hat Robot.servo_move splits a move, shared by the simulator,
+    AsyncPicrawler and the recording playback.
+
+    delta:  angle change of every servo
+    return: number of STEP_TIME steps, 0 when no servo moves
+    '''
+    speed = max(0, min(100, speed))
+    max_delta = int(max(abs(d) for d in delta))
+    if max_delta == 0:
+        return 0
+    if bpm:
+        total_time = 60 / bpm * 1000
+    else:
+        total_time = -9.9 * speed + 1000
+    if max_delta / total_time * 1000 > max_dps:
+        total_time = max_delta / max_dps * 1000
+    return max(1, int(total_time / STEP_TIME))
+
+
+class SimBus(object):
+    '''
+    Recorded I2C bus of the Robot HAT.
+
+    latency:   seconds per transaction, ~0.4 ms for a 4 byte write at 100 kHz
+    byte_time: seconds per extra byte of a block write, 9 bits at 100 kHz
+    '''
+    def __init__(self, backend, latency=0.0004, byte_time=0.00009):
+        self.backend = backend
+        self.latency = latency
+        self.byte_time = byte_time
+        self.reset()
+
+    def reset(self):
+        self.writes = [] # (time, channel, pulse width in us)
+        self.transactions = 0
+
+    def write(self, channel, pulse_width):
+        self.writes.append((self.backend.now(), channel, pulse_width))
+        self.transactions += 1
+        self.backend.sleep(self.latency)
+
+    def write_block(self, channel, pulse_widths):
+        # one transaction for the channels channel, channel + 1 ..., 2 bytes each
+        now = self.backend.now()
+        for i, pulse_width in enumerate(pulse_widths):
+            self.writes.append((now, channel + i, pulse_width))
+        self.transactions += 1
+        self.backend.sleep(self.latency + 2 * (len(pulse_widths) - 1) * self.byte_time)
+
+
+def channel_runs(channels):
+    '''
+    Split channel numbers into runs of contiguous channels.
+
+    return: list of (first channel, [indexes into channels]), in channel order
+    '''
+    order = sorted(range(len(channels)), key=lambda i: channels[i])
+    runs = []
+    for i in order:
+        if runs and channels[i] == channels[runs[-1][1][-1]] + 1:
+            runs[-1][1].append(i)
+        else:
+            runs.append((channels[i], [i]))
+    return runs
+
+
+class SimServo(object):
+    '''
+    Stand-in for robot_hat.Servo.
+
+    slew_rate: deg/s the horn can turn, ~0.1 s / 60 deg for the SF006FM
+    '''
+    MIN_PW = 500
+    MAX_PW = 2500
+
+    def __init__(self, channel, backend, slew_rate=600):
+        self.channel = channel
+        self.backend = backend
+        self.slew_rate = slew_rate
+        self.target = 0.0
+        self.start = 0.0
+        self.start_time = backend.now()
+
+    def angle(self, angle):
+        self.backend.bus.write(self.channel, self.command(angle))
+
+    def command(self, angle):
+        # new target without writing it, return: pulse width in us
+        angle = max(-90, min(90, angle))
+        # the horn keeps moving from wherever it is now
+        now = self.backend.now()
+        self.start = self.position(now)
+        self.start_time = now
+        self.target = angle
+        return self.MIN_PW + (angle + 90) / 180 * (self.MAX_PW - self.MIN_PW)
+
+    def position(self, now=None):
+        # physical angle, moving towards target at slew_rate
+        if now is None:
+            now = self.backend.now()
+        travel = self.slew_rate * (now - self.start_time)
+        if abs(self.target - self.start) <= travel:
+            return self.target
+        return self.start + travel if self.target > self.start else self.start - travel
+
+
+class MemoryDB(object):
+    # robot_hat fileDB without the file, for the offsets
+    def __init__(self):
+        self.values = {}
+
+    def get(self, name, default_value=None):
+        return self.values.get(name, default_value)
+
+    def set(self, name, value):
+        self.values[name] = value
+
+
+class SimBackend(object):
+    '''
+    slew_rate:   servo speed in deg/s
+    i2c_latency: seconds per bus transaction
+    realtime:    really sleep instead of advancing the virtual clock
+    batch:       bus supports block writes, see write_servos
+    '''
+    STEP_TIME = STEP_TIME
+
+    def __init__(self, slew_rate=600, i2c_latency=0.0004, realtime=False, batch=True):
+        self.slew_rate = slew_rate
+        self.realtime = realtime
+        self.batch = batch
+        self.clock = 0.0
+        self.bus = SimBus(self, i2c_latency)
+
+    def now(self):
+        return time.perf_counter() if self.realtime else self.clock
+
+    def sleep(self, seconds):
+        if seconds <= 0:
+            return
+        if self.realtime:
+            time.sleep(seconds)
+        else:
+            self.clock += seconds
+
+    def attach(self, robot, pin_list, name=None, init_angles=None):
+        '''
+        Set up robot the way robot_hat Robot.__init__ does, on simulated servos
+        '''
+        robot.pin_num = len(pin_list)
+        robot.name = name if name is not None else 'other'
+        robot.offset_value_name = "%s_servo_offset_list"%robot.name
+        robot.db = MemoryDB()
+        robot.offset = [0] * robot.pin_num
+        robot.servo_positions = [0] * robot.pin_num
+        robot.origin_positions = [0] * robot.pin_num
+        robot.calibrate_position = [0] * robot.pin_num
+        robot.direction = [1] * robot.pin_num
+        if init_angles is None:
+            init_angles = [0] * robot.pin_num
+        elif len(init_angles) != robot.pin_num:
+            raise ValueError('init angles numbers do not match pin numbers ')
+        robot.servo_list = [SimServo(pin, self, self.slew_rate) for pin in pin_list]
+        for i in range(robot.pin_num):
+            robot.servo_positions[i] = init_angles[i]
+            robot.servo_list[i].angle(robot.offset[i] + robot.servo_positions[i])
+        robot.last_move_time = self.now()
+
+    def servo_move(self, robot, targets, speed=50, bpm=None):
+        '''
+        robot_hat Robot.servo_move on the simulated clock
+        '''
+        delta = [targets[i] - robot.servo_positions[i] for i in range(robot.pin_num)]
+        max_step = move_steps(delta, speed, bpm, getattr(robot, 'max_dps', MAX_DPS))
+        if max_step == 0:
+            self.sleep(self.STEP_TIME/1000)
+            return
+        steps = [d / max_step for d in delta]
+
+        for _ in range(max_step):
+            start = self.now()
+            for j in range(robot.pin_num):
+                robot.servo_positions[j] += steps[j]
+            robot.servo_write_all(robot.servo_positions)
+            self.sleep(self.STEP_TIME/1000 - (self.now() - start))
+
+    def write_servos(self, robot, indexes, angles):
+        '''
+        Write several servos of robot, one block write per run of contiguous
+        channels. Only when batch is True, else use servo.angle() per servo.
+
+        indexes: servo_list indexes
+        angles:  raw angles, as passed to servo_write_raw
+        '''
+        servos = [robot.servo_list[i] for i in indexes]
+        pulse_widths = [servo.command(angle) for servo, angle in zip(servos, angles)]
+        for channel, run in channel_runs([servo.channel for servo in servos]):
+            self.bus.write_block(channel, [pulse_widths[i] for i in run])
+
+    def positions(self, robot):
+        # physical angles of the servos, in servo_positions order
+        return [servo.position() for servo in robot.servo_list]
+
+
+class SimRobot(object):
+    '''
+    Replaces robot_hat.Robot as Picrawler's base class when robot_hat is not
+    installed, only the parts the simulated backend needs.
+    '''
+    max_dps = MAX_DPS
+
+    def __init__(self, *args, **kwargs):
+        raise ImportError('robot_hat is not installed, use Picrawler(backend="sim")')
+
+    def new_list(self, default_value):
+        return [default_value] * self.pin_num
+
+    def servo_write_raw(self, angle_list):
+        for i in range(self.pin_num):
+            self.servo_list[i].angle(angle_list[i])
+
+    def servo_write_all(self, angles):
+        rel_angles = []
+        for i in range(self.pin_num):
+            rel_angles.append(self.direction[i] * (self.origin_positions[i] + angles[i] + self.offset[i]))
+        self.servo_write_raw(rel_angles)
+
+    def set_offset(self, offset_list):
+        offset_list = [min(max(offset, -20), 20) for offset in offset_list]
+        self.db.set(self.offset_value_name, str(offset_list))
+        self.offset = offset_list
@@ -0,0 +1,174 @@
+'''
+Benchmarks of the kinematics and gait pipeline, on the simulated backend.
+
+    python3 -m picrawler.bench
+    python3 -m picrawler.bench --preset wave_hand --preset nod --json bench.json
+    python3 -m picrawler.bench --preset-file examples/preset_actions.py
+    python3 -m picrawler.bench --compare bench.json
+
+Every stage is timed call by call with perf_counter_ns, the report gives
+throughput (calls/s) and latency percentiles in microseconds. Every gait
+and every preset action (presets.py, --preset to pick some) is run, they
+also report the simulated motion time and the number of
+bus transactions, with block writes (the real Robot HAT writes one servo
+per transaction). With --compare the
+p50 of each stage is checked against an earlier JSON report and the exit
+code is 1 if anything got slower than --threshold times.
+'''
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from . import presets
+from .picrawler import Picrawler
+from .version import __version__
+
+STEP = [[45, 45, -50], [45, 0, -50], [45, 0, -50], [45, 45, -50]]
+
+
+def measure(func, repeat):
+    '''
+    Call func repeat times, return the stats of the single calls
+    '''
+    samples = np.empty(repeat, dtype=np.int64)
+    for i in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        samples[i] = time.perf_counter_ns() - start
+    us = samples / 1000
+    return {
+        'calls': repeat,
+        'throughput': float(repeat / (samples.sum() / 1e9)) if samples.sum() else 0.0,
+        'mean_us': float(us.mean()),
+        'p50_us': float(np.percentile(us, 50)),
+        'p90_us': float(np.percentile(us, 90)),
+        'p99_us': float(np.percentile(us, 99)),
+        'max_us': float(us.max()),
+    }
+
+
+def load_preset(path, spider):
+    # the preset module's sleep() runs on the simulated clock
+    spec = importlib.util.spec_from_file_location('preset_actions', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if hasattr(module, 'sleep'):
+        module.sleep = spider.sim.sleep
+    return module.actions_dict
+
+
+def reset_pose(spider):
+    spider.do_step(STEP, 100)
+
+
+def run(repeat=200, action_repeat=5, preset=None, preset_file=None):
+    '''
+    preset:      names of the preset actions to run, None for all of them
+    preset_file: preset_actions.py whose actions_dict is run too
+    '''
+    spider = Picrawler(backend='sim')
+    # compiled in memory, the benchmark does not read or write the cache
+    spider.presets = presets.PresetLibrary(spider, directory=False)
+    results = {}
+
+    frames = np.array(spider.move_list['dance'], dtype=float)
+    coord = STEP[0]
+    angles = [spider.coord2polar(c) for c in STEP]
+    angles = [[a[1], a[0], a[2]] for a in angles]
+
+    results['coord2polar'] = measure(lambda: spider.coord2polar(coord), repeat * 10)
+    results['limit_angle'] = measure(lambda: spider.limit_angle(angles[0]), repeat * 10)
+    results['coord2polar_batch[dance]'] = measure(lambda: spider.coord2polar_batch(frames), repeat)
+    results['set_angle'] = measure(lambda: spider.set_angle(angles, 100), repeat)
+    results['do_step'] = measure(lambda: spider.do_step(STEP, 100), repeat)
+
+    def action(name, func):
+        reset_pose(spider)
+        start = spider.sim.clock
+        spider.sim.bus.reset()
+        func()
+        motion = spider.sim.clock - start
+        transactions = spider.sim.bus.transactions
+        stats = measure(func, action_repeat)
+        stats['motion_s'] = motion
+        stats['bus_transactions'] = transactions
+        return stats
+
+    for name in spider.MoveList.GAITS:
+        if ' ' in name:
+            continue
+        def cold(name=name):
+            spider.gait_cache.clear()
+            spider.do_action(name, 1, 100)
+        results['do_action[%s]'%name] = action(name, lambda name=name: spider.do_action(name, 1, 100))
+        results['do_action_cold[%s]'%name] = measure(cold, action_repeat)
+
+    for name, func in presets.actions_dict(presets.NAMES if preset is None else preset).items():
+        results['preset[%s]'%name] = action(name, lambda func=func: func(spider))
+
+    if preset_file:
+        for name, func in load_preset(preset_file, spider).items():
+            results['preset_file[%s]'%name] = action(name, lambda func=func: func(spider))
+
+    return {
+        'version': __version__,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for name, stats in report['results'].items():
+        old = baseline['results'].get(name)
+        if old and old['p50_us'] > 0 and stats['p50_us'] / old['p50_us'] > threshold:
+            regressions.append((name, old['p50_us'], stats['p50_us']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Picrawler kinematics and gait pipeline')
+    parser.add_argument('--repeat', type=int, default=200, help='calls per kinematics stage (x10 for the scalar ones)')
+    parser.add_argument('--action-repeat', type=int, default=5, help='runs per gait / preset action')
+    parser.add_argument('--preset', action='append', help='preset action to benchmark, repeat for more, default all')
+    parser.add_argument('--preset-file', help='preset_actions.py to benchmark the actions_dict of too')
+    parser.add_argument('--json', help='write the report to this file, - for stdout')
+    parser.add_argument('--compare', help='earlier JSON report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.2, help='p50 ratio counted as a regression')
+    args = parser.parse_args()
+    unknown = [name for name in args.preset or () if name not in presets.NAMES]
+    if unknown:
+        parser.error('no such preset action: %s, use one of %s'%(', '.join(unknown), ', '.join(presets.NAMES)))
+
+    report = run(args.repeat, args.action_repeat, args.preset, args.preset_file)
+
+    if args.json == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        print('picrawler %s, python %s, %s'%(report['version'], report['python'], report['machine']))
+        print('%-32s %12s %10s %10s %10s %10s'%('stage', 'calls/s', 'p50 us', 'p90 us', 'p99 us', 'max us'))
+        for name, stats in report['results'].items():
+            print('%-32s %12.1f %10.1f %10.1f %10.1f %10.1f'%(name, stats['throughput'], stats['p50_us'],
+                stats['p90_us'], stats['p99_us'], stats['max_us']))
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, old, new in regressions:
+            print('regression %s: p50 %.1f us -> %.1f us'%(name, old, new))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
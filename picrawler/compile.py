@@ -0,0 +1,33 @@
+import argparse
+import os
+
+from picrawler import Picrawler
+from . import presets as library
+from .compiled import compile_action, save_action, load_preset, EXTENSION
+
+# python3 -m picrawler.compile forward nod -o actions/
+# python3 -m picrawler.compile forward nod --preset examples/preset_actions.py -o actions/
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile Picrawler actions to %s files'%EXTENSION)
+    parser.add_argument('actions', nargs='+', help='action names, MoveList gaits, picrawler.presets actions or preset actions')
+    parser.add_argument('--preset', help='preset_actions.py whose actions_dict provides the named actions')
+    parser.add_argument('-o', '--output', default='.', help='output directory')
+    args = parser.parse_args()
+
+    presets = load_preset(args.preset) if args.preset else library.actions_dict()
+    # only the IK and the sleeps are needed, nothing is sent to the servos
+    spider = Picrawler(backend='sim')
+    for name in args.actions:
+        if not args.preset and name in library.STEP_ACTIONS:
+            # the pauses of the declaration have to survive the capture
+            frames = library.check_delays(spider, name)
+        else:
+            frames = compile_action(spider, presets.get(name, name))
+        path = os.path.join(args.output, name.replace(' ', '_') + EXTENSION)
+        save_action(path, frames)
+        print('%s: %d frames, %.1f s of pauses -> %s'%(name, len(frames), frames['delay'].sum(), path))
+
+
+if __name__ == '__main__':
+    main()
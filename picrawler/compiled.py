@@ -0,0 +1,130 @@
+'''
+Compiled actions: the servo angles of every frame of an action, solved once
+and stored in a small binary file, so playback needs no IK and no limit
+checks.
+
+File layout (little endian):
+    header  '<4sHHI'  magic b'PCAC', version, reserved, number of frames
+    frames  FRAME * n
+'''
+import numpy as np
+import struct
+import threading
+import time
+
+MAGIC = b'PCAC'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+FRAME = np.dtype([
+    ('angles', '<f4', (12,)),   # as passed to servo_move
+    ('coords', '<f4', (4, 3)),  # current_coord after the frame
+    ('speed', '<f4'),
+    ('delay', '<f4'),           # seconds to wait after the frame, the sleep() in preset actions
+])
+EXTENSION = '.pca'
+
+
+def compile_action(spider, action):
+    '''
+    Run an action on the Picrawler with servo_move captured instead of moving
+    the servos, and return its frames.
+
+    The pauses of the action are captured too: spider.sleep (play_compiled,
+    the preset library) and the `from time import sleep` of the action's
+    module are replaced, on this thread, by a sleep adding its seconds to
+    the delay of the frame before it. A pause before the first frame is
+    dropped. time.sleep itself is not touched, a time.sleep() of the action
+    really waits and is not recorded.
+
+    Actions running a control loop (do_trajectory, play_recording, walk)
+    raise TypeError, their setpoints are not servo_move frames.
+
+    spider: Picrawler
+    action: an action name do_action knows, or a function taking the
+            Picrawler like the actions_dict entries of preset_actions.py
+    return: numpy array of FRAME
+    '''
+    if not callable(action) and action not in spider.actions:
+        raise ValueError('No such action: %s'%action)
+
+    captured = []
+    def capture(targets, speed=50, bpm=None):
+        captured.append([list(targets), [list(coord) for coord in spider.current_coord], speed, 0.0])
+
+    def sleep(seconds):
+        if captured:
+            captured[-1][3] += seconds
+
+    def refuse(*args, **kwargs):
+        raise TypeError('%s runs a control loop, it cannot be compiled into servo_move frames'%getattr(action, '__name__', action))
+
+    thread = threading.current_thread()
+    real_sleep = time.sleep
+    def module_sleep(seconds):
+        # the module is shared, only the compiling thread's sleeps belong to the action
+        if threading.current_thread() is thread:
+            sleep(seconds)
+        else:
+            real_sleep(seconds)
+    module = getattr(action, '__globals__', {})
+    patch_module = module.get('sleep') is real_sleep
+
+    # running the action moves the gait state on, put it back afterwards
+    move_list = spider.move_list
+    state = (spider.stand_position, move_list.stand_position, move_list.z_current, move_list.ready_state,
+        [list(coord) for coord in spider.current_coord], spider.coord_temp, spider.telemetry, spider.recorder)
+    # nothing is sent to the servos, nothing to record
+    spider.telemetry = None
+    spider.recorder = None
+    spider.servo_move = capture
+    spider.sleep = sleep
+    spider.write_setpoint = refuse
+    spider.walk = refuse
+    if patch_module:
+        module['sleep'] = module_sleep
+    try:
+        if callable(action):
+            action(spider)
+        else:
+            spider.do_action(action)
+    finally:
+        del spider.servo_move, spider.sleep, spider.write_setpoint, spider.walk
+        if patch_module:
+            module['sleep'] = real_sleep
+        (spider.stand_position, move_list.stand_position, move_list.z_current, move_list.ready_state,
+            spider.current_coord, spider.coord_temp, spider.telemetry, spider.recorder) = state
+
+    frames = np.zeros(len(captured), dtype=FRAME)
+    for i, (angles, coords, speed, delay) in enumerate(captured):
+        frames[i] = (angles, coords, speed, delay)
+    return frames
+
+
+def save_action(path, frames):
+    frames = np.asarray(frames, dtype=FRAME)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(frames)))
+        f.write(frames.tobytes())
+
+
+def load_action(path):
+    '''
+    Memory map a compiled action file, return a read-only array of FRAME
+    '''
+    with open(path, 'rb') as f:
+        magic, version, _, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('%s is not a compiled action file (version %s)'%(path, VERSION))
+    if count == 0:
+        return np.zeros(0, dtype=FRAME)
+    return np.memmap(path, dtype=FRAME, mode='r', offset=HEADER.size, shape=(count,))
+
+
+def load_preset(path):
+    # actions_dict of a preset_actions.py file
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('preset_actions', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.actions_dict
+
@@ -0,0 +1,136 @@
+import numpy as np
+import threading
+import time
+
+
+class ControlLoop(object):
+    '''
+    Fixed rate loop sending one setpoint per tick.
+
+    Ticks are scheduled on absolute deadlines (start + n * period), so the
+    time spent computing and writing does not make the loop drift. A tick
+    that ends after the next deadline is an overrun, the ticks it ran over
+    are skipped (counted as missed) instead of being sent in a burst.
+
+    Per tick it records the wake-up latency (how late the tick started
+    against its deadline) and the work time (source + write), the last
+    `history` ticks are kept in preallocated arrays for percentiles and the
+    latency of every tick goes into a fixed histogram.
+
+    rate:    Hz
+    history: number of ticks kept for percentiles
+    '''
+    # upper edges in ms of the latency histogram bins, the last bin is open
+    BINS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20)
+
+    def __init__(self, rate=50, history=1000):
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.latency = np.zeros(history)
+        self.work = np.zeros(history)
+        self.histogram = np.zeros(len(self.BINS) + 1, dtype=np.int64)
+        self.bins = np.array(self.BINS) / 1000
+        self.running = False
+        self.thread = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.overruns = 0
+        self.missed = 0
+        self.histogram[:] = 0
+        self.started = None
+        self.stopped = None
+
+    def run(self, source, write):
+        '''
+        Run until source is exhausted or stop() is called.
+
+        source: iterable of setpoints, or a function called every tick with
+                the tick number returning the setpoint, None to stop
+        write:  function sending one setpoint, e.g. servo_write_all
+        '''
+        self.running = True
+        self.loop(source, write)
+
+    def loop(self, source, write):
+        # run() without setting running, start() sets it before the thread
+        # starts so a stop() in between is not undone
+        if callable(source):
+            next_setpoint = source
+        else:
+            iterator = iter(source)
+            next_setpoint = lambda tick: next(iterator, None)
+
+        period = self.period
+        history = len(self.latency)
+        start = time.perf_counter()
+        self.started = start
+        deadline = start
+        tick = 0
+        try:
+            while self.running:
+                wake = time.perf_counter()
+                setpoint = next_setpoint(tick)
+                if setpoint is None:
+                    break
+                write(setpoint)
+                end = time.perf_counter()
+
+                late = wake - deadline
+                i = self.ticks % history
+                self.latency[i] = late
+                self.work[i] = end - wake
+                self.histogram[np.searchsorted(self.bins, late)] += 1
+                self.ticks += 1
+                tick += 1
+
+                deadline += period
+                if end > deadline:
+                    # overran into the next tick(s), realign instead of catching up
+                    self.overruns += 1
+                    skipped = int((end - deadline) / period) + 1
+                    self.missed += skipped
+                    deadline += skipped * period
+                time.sleep(max(0, deadline - time.perf_counter()))
+        finally:
+            self.running = False
+            self.stopped = time.perf_counter()
+
+    def start(self, source, write):
+        # run() on a background thread
+        self.thread = threading.Thread(target=self.loop, args=(source, write), name='picrawler-control', daemon=True)
+        self.running = True
+        self.thread.start()
+        return self.thread
+
+    def stop(self, wait=True):
+        self.running = False
+        if wait and self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def stats(self):
+        '''
+        return: dict, times in ms
+        '''
+        n = min(self.ticks, len(self.latency))
+        latency = self.latency[:n] * 1000
+        work = self.work[:n] * 1000
+        end = self.stopped if not self.running and self.stopped else time.perf_counter()
+        elapsed = end - self.started if self.started else 0
+        labels = ['<%sms'%edge for edge in self.BINS] + ['>=%sms'%self.BINS[-1]]
+        return {
+            'rate': self.rate,
+            'achieved_rate': self.ticks / elapsed if elapsed > 0 else 0.0,
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'missed': self.missed,
+            'latency_mean': float(latency.mean()) if n else 0.0,
+            'latency_p50': float(np.percentile(latency, 50)) if n else 0.0,
+            'latency_p99': float(np.percentile(latency, 99)) if n else 0.0,
+            'latency_max': float(latency.max()) if n else 0.0,
+            'jitter': float(latency.std()) if n else 0.0,
+            'work_mean': float(work.mean()) if n else 0.0,
+            'work_max': float(work.max()) if n else 0.0,
+            'histogram': dict(zip(labels, self.histogram.tolist())),
+        }
@@ -0,0 +1,136 @@
+from concurrent.futures import Future
+from collections import deque
+import threading
+
+
+class MotionCancelled(Exception):
+    '''
+    Raised inside a motion when it is cancelled or preempted, and set on its
+    future.
+    '''
+
+
+class MotionExecutor(object):
+    '''
+    Runs motions on a background thread, one at a time and in order, so the
+    caller can keep sensing while the legs move.
+
+    A motion is an action name (run with Picrawler.do_action) or a function
+    taking the Picrawler, like the actions_dict entries of preset_actions.py.
+    Cancelling stops the running motion at the next frame boundary, a frame
+    already sent to servo_move is finished first.
+    '''
+
+    def __init__(self, spider):
+        self.spider = spider
+        self.jobs = deque()
+        self.current = None
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name='picrawler-motion', daemon=True)
+        self.thread.start()
+
+    def _job(self, action, args, kwargs):
+        future = Future()
+        if callable(action):
+            job = lambda: action(self.spider, *args, **kwargs)
+        else:
+            job = lambda: self.spider.do_action(action, *args, **kwargs)
+        return future, job
+
+    def submit(self, action, *args, **kwargs):
+        '''
+        Queue a motion behind the ones already submitted.
+
+        return: concurrent.futures.Future, done when the motion finishes
+        '''
+        future, job = self._job(action, args, kwargs)
+        with self.condition:
+            if not self.running:
+                raise RuntimeError('Motion executor is shut down.')
+            self.jobs.append((future, job))
+            self.condition.notify()
+        return future
+
+    def _cancel_locked(self):
+        for future, _ in self.jobs:
+            future.cancel()
+        self.jobs.clear()
+        if self.current is not None:
+            self.spider.cancel_event.set()
+
+    def cancel(self, future=None):
+        '''
+        Drop the queued motions and stop the running one, or with future,
+        only the motion of that future.
+        '''
+        with self.condition:
+            if future is None:
+                self._cancel_locked()
+            elif future is self.current:
+                self.spider.cancel_event.set()
+            else:
+                for job in self.jobs:
+                    if job[0] is future:
+                        self.jobs.remove(job)
+                        future.cancel()
+                        break
+
+    def preempt(self, action, *args, **kwargs):
+        '''
+        Like cancel() followed by submit(), the new motion starts as soon as
+        the running one reaches a frame boundary.
+        '''
+        future, job = self._job(action, args, kwargs)
+        with self.condition:
+            if not self.running:
+                raise RuntimeError('Motion executor is shut down.')
+            self._cancel_locked()
+            self.jobs.append((future, job))
+            self.condition.notify()
+        return future
+
+    def is_busy(self):
+        with self.condition:
+            return self.current is not None or len(self.jobs) > 0
+
+    def wait(self, timeout=None):
+        '''
+        Block until every submitted motion is done, return False on timeout.
+        '''
+        with self.condition:
+            return self.condition.wait_for(lambda: self.current is None and not self.jobs, timeout)
+
+    def shutdown(self, wait=True, cancel=False):
+        with self.condition:
+            if cancel:
+                self._cancel_locked()
+            self.running = False
+            self.condition.notify_all()
+        if wait and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def _loop(self):
+        while True:
+            with self.condition:
+                while self.running and not self.jobs:
+                    self.condition.wait()
+                if not self.jobs:
+                    return
+                future, job = self.jobs.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self.current = future
+                # a cancel aimed at the previous motion must not hit this one
+                self.spider.cancel_event.clear()
+
+            try:
+                result = job()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                with self.condition:
+                    self.current = None
+                    self.condition.notify_all()
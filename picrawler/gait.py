@@ -0,0 +1,257 @@
+'''
+Parametric gaits: one walking cycle generated from stride, lift, body
+height and duty factor instead of the fixed MoveList constants.
+
+Each leg works in its own frame (x out to the side, y out to the front for
+legs 0 and 1, to the back for legs 2 and 3, z up), the cycle is planned in
+the body frame (X to the right, Y forward, hips on the corners of a
+LENGTH_SIDE square, legs 0 and 3 on the right) and mapped back.
+
+In a cycle the body moves by (dx, dy) mm and turns by yaw degrees
+(positive = left). Every leg is on the ground for `duty` of the cycle,
+sliding back under the body, and swings forward for the rest. duty >= 0.75
+is a creep, one leg after the other (right back, right front, left back,
+left front), at most one in the air. Below that the front legs' swings are
+moved later until, at 0.5, each front leg swings with the back leg
+diagonal to it like a trot: (0, 2) and (1, 3). Two legs of the same side
+are never in the air together.
+'''
+from collections import OrderedDict
+import math
+
+import numpy as np
+
+LENGTH_SIDE = 77
+SIDE = np.array([1, -1, -1, 1])     # leg x -> body X
+FRONT = np.array([1, 1, -1, -1])    # leg y -> body Y
+SWING_ORDER = (3, 0, 2, 1)
+# legs whose swing moves half a swing later per 0.25 of duty below 0.75
+TROT_SHIFT = np.array([1, 1, 0, 0])
+# foot position in the middle of the stance, leg frame
+NEUTRAL = (45, 25)
+
+HALF = LENGTH_SIDE / 2
+HIPS = np.stack((SIDE * HALF, FRONT * HALF), axis=1)
+
+GAITS = ('forward', 'backward', 'left', 'right', 'turn_left', 'turn_right')
+# parameter steps the compiled tables are cached at
+QUANTUM = {'stride': 1, 'lift': 1, 'height': 1, 'duty': 0.05, 'turn': 1}
+
+
+def motion(gait, stride, turn):
+    # (dx, dy, yaw) of one cycle of a named gait
+    if gait == 'forward':
+        return 0, stride, 0
+    elif gait == 'backward':
+        return 0, -stride, 0
+    elif gait == 'left':
+        return -stride, 0, 0
+    elif gait == 'right':
+        return stride, 0, 0
+    elif gait == 'turn_left':
+        return 0, 0, turn
+    elif gait == 'turn_right':
+        return 0, 0, -turn
+    raise ValueError('Unknown gait %s, use one of %s'%(gait, GAITS))
+
+
+def to_body(coords):
+    # leg frame coords (..., 4, 3) -> body frame feet (..., 4, 2)
+    coords = np.asarray(coords, dtype=float)
+    return HIPS + np.stack((SIDE * coords[..., 0], FRONT * coords[..., 1]), axis=-1)
+
+
+def to_legs(feet, z):
+    # body frame feet (..., 4, 2) and heights -> leg frame coords (..., 4, 3)
+    coords = np.empty(feet.shape[:-1] + (3,))
+    coords[..., 0] = SIDE * (feet[..., 0] - HIPS[:, 0])
+    coords[..., 1] = FRONT * (feet[..., 1] - HIPS[:, 1])
+    coords[..., 2] = z
+    return coords
+
+
+def swing_offsets(duty):
+    # per leg start of the swing in the cycle, creep order shifted towards diagonal pairs
+    shift = min(max((0.75 - duty) / 0.25, 0), 1) * 0.25
+    return np.array([SWING_ORDER.index(leg) for leg in range(4)]) / 4 + TROT_SHIFT * shift
+
+
+def swing_phase(phase, duty):
+    # per leg position in its own cycle, and whether it is swinging
+    offset = swing_offsets(duty)
+    p = (np.asarray(phase)[..., np.newaxis] - offset) % 1
+    return p, p < 1 - duty
+
+
+def cycle(dx=0, dy=45, yaw=0, lift=20, height=50, duty=0.75, frames=16, neutral=NEUTRAL):
+    '''
+    One walking cycle.
+
+    dx, dy:  body travel per cycle in mm, X to the right, Y forward
+    yaw:     body turn per cycle in degrees, positive to the left
+    lift:    mm the swinging foot is raised
+    height:  mm from the body down to the feet
+    duty:    fraction of the cycle each foot is on the ground, 0.5 - 1
+    frames:  frames per cycle, a multiple of 4 keeps the swings aligned
+    return:  ndarray (frames, 4, 3) of foot coordinates, as do_step takes
+    '''
+    if not 0.5 <= duty < 1:
+        raise ValueError('duty must be in [0.5, 1), not %s'%duty)
+    feet = to_body([neutral + (0,)] * 4)
+    p, in_swing = swing_phase(np.arange(frames) / frames, duty)
+    swing = 1 - duty
+
+    # stance: the foot stays put while the body moves from -1/2 to +1/2 of
+    # the cycle motion, swing: back from +1/2 to -1/2 along a smooth step
+    u = np.where(in_swing, p / swing, 0)
+    s = np.where(in_swing, 0, (p - swing) / duty)
+    smooth = u * u * (3 - 2 * u)
+    a = np.where(in_swing, 0.5 - smooth, s - 0.5)
+
+    angle = -a * math.radians(yaw)
+    cos, sin = np.cos(angle), np.sin(angle)
+    X = cos * feet[:, 0] - sin * feet[:, 1] - a * dx
+    Y = sin * feet[:, 0] + cos * feet[:, 1] - a * dy
+
+    return to_legs(np.stack((X, Y), axis=-1), -height + lift * np.sin(math.pi * u) * in_swing)
+
+
+def generate(gait='forward', stride=45, lift=20, height=50, duty=0.75, turn=20, frames=16):
+    '''
+    A cycle of a named gait, see GAITS. stride is the body travel in mm per
+    cycle, turn the degrees per cycle of the turn gaits.
+    '''
+    dx, dy, yaw = motion(gait, stride, turn)
+    return cycle(dx, dy, yaw, lift, height, duty, frames)
+
+
+class VelocityWalker(object):
+    '''
+    Walking driven by a velocity command, one frame per control tick.
+
+    The feet are integrated tick by tick instead of read from a fixed
+    cycle: the feet on the ground move against the body velocity, a
+    swinging foot heads for where it has to land to be centred in its next
+    stance under the current command. A new command is therefore followed
+    from the next tick on, without jumps. With a zero command the feet are
+    brought back to neutral and the walker stops lifting them.
+
+    period:    seconds per cycle
+    max_speed: mm/s, the command is scaled down to it (the stride is
+               max_speed * period)
+    '''
+    def __init__(self, period=1.0, lift=20, height=50, duty=0.75, max_speed=50, max_yaw_rate=30, neutral=NEUTRAL):
+        if not 0.5 <= duty < 1:
+            raise ValueError('duty must be in [0.5, 1), not %s'%duty)
+        self.period = period
+        self.lift = lift
+        self.height = height
+        self.duty = duty
+        self.max_speed = max_speed
+        self.max_yaw_rate = max_yaw_rate
+        self.neutral = to_body([neutral + (0,)] * 4)
+        self.command = (0.0, 0.0, 0.0)
+        self.reset()
+
+    def reset(self, coords=None):
+        # start from coords (leg frame, (4, 3)), default the neutral stance
+        self.feet = self.neutral.copy() if coords is None else to_body(coords)
+        self.phase = 0.0
+        self.idle = True
+
+    def stance(self):
+        # neutral stance at the walking height, leg frame (4, 3)
+        return to_legs(self.neutral, -self.height)
+
+    def place(self, coords):
+        # the feet are not where step() put them (e.g. angles limited), go on from coords
+        self.feet = to_body(coords)
+
+    def set_command(self, vx=0, vy=0, yaw_rate=0):
+        '''
+        vx, vy:   mm/s, to the right and forward
+        yaw_rate: deg/s, positive to the left
+        '''
+        speed = math.hypot(vx, vy)
+        if speed > self.max_speed:
+            vx, vy = vx * self.max_speed / speed, vy * self.max_speed / speed
+        yaw_rate = max(-self.max_yaw_rate, min(self.max_yaw_rate, yaw_rate))
+        self.command = (vx, vy, yaw_rate)
+
+    def step(self, dt):
+        '''
+        Advance dt seconds, return the foot coordinates (4, 3) in leg frames
+        '''
+        vx, vy, yaw_rate = self.command
+        moving = vx or vy or yaw_rate
+        if not moving and self.idle:
+            return to_legs(self.feet, -self.height)
+        if moving:
+            self.idle = False
+        elif np.abs(self.feet - self.neutral).max() < 0.5:
+            # feet back to neutral after the command went to zero
+            self.idle = True
+            self.phase = 0.0
+            return to_legs(self.feet, -self.height)
+
+        self.phase = (self.phase + dt / self.period) % 1
+        p, in_swing = swing_phase(self.phase, self.duty)
+        swing = 1 - self.duty
+
+        # on the ground: the body moves, the feet move the other way
+        angle = -math.radians(yaw_rate) * dt
+        cos, sin = math.cos(angle), math.sin(angle)
+        X, Y = self.feet[:, 0], self.feet[:, 1]
+        ground = np.stack((cos * X - sin * Y - vx * dt, sin * X + cos * Y - vy * dt), axis=-1)
+
+        # in the air: to half a stance of motion ahead of neutral
+        half = self.duty * self.period / 2
+        angle = math.radians(yaw_rate) * half
+        cos, sin = math.cos(angle), math.sin(angle)
+        X, Y = self.neutral[:, 0], self.neutral[:, 1]
+        target = np.stack((cos * X - sin * Y + vx * half, sin * X + cos * Y + vy * half), axis=-1)
+        remaining = np.maximum((swing - p) * self.period, dt)[:, np.newaxis]
+        air = self.feet + (target - self.feet) * np.minimum(1, dt / remaining)
+
+        self.feet = np.where(in_swing[:, np.newaxis], air, ground)
+        u = np.where(in_swing, p / swing, 0)
+        return to_legs(self.feet, -self.height + self.lift * np.sin(math.pi * u) * in_swing)
+
+
+def quantize(**params):
+    # params rounded to QUANTUM steps, as a hashable key
+    return tuple(sorted((name, round(round(value / QUANTUM[name]) * QUANTUM[name], 6) if name in QUANTUM else value)
+        for name, value in params.items()))
+
+
+class LRUCache(object):
+    '''
+    Least recently used cache of at most maxsize entries.
+    '''
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,205 @@
+import numpy as np
+import os
+
+from .kinematics import A, B, C, clamp_radius, clamp_radius_batch, coord2polar, coord2polar_batch, limit_angle_batch
+
+# Box around the reachable workspace of one leg. The radius is clamped to
+# A+B+C (159 mm) and gamma to [-60, 60] deg, i.e. atan2(y, x) in [-15, 105] deg,
+# so x and y never need to go much below -0.26 * 159. What is outside after the
+# radius clamp is solved exactly.
+BOUNDS = ((-45, 160), (-45, 160), (-160, 160))
+
+
+class IKTable(object):
+    '''
+    Inverse kinematics by lookup: the joint angles of one leg are precomputed
+    on a regular grid over the workspace and queries are answered by trilinear
+    interpolation, so no acos / atan2 is called at runtime.
+
+    Queries are clamped onto [C, A+B+C] from the leg root first, like
+    coord2polar does. Points that are then still outside the box, and the
+    cells where interpolation is off by more than tolerance (around the leg
+    root, the atan2 wrap-around, the ends of the u clamp), are solved
+    exactly with kinematics.coord2polar instead.
+
+    The grid is stored as a .npy file (shape (nx, ny, nz, 3), float32,
+    [alpha, beta, gamma] as returned by Picrawler.coord2polar) and memory
+    mapped, next to the max error of each cell (<path>_error.npy, shape
+    (nx-1, ny-1, nz-1)). Both are built the first time a resolution is used.
+
+    path:       .npy file, default ik_table_<resolution>mm.npy in directory
+    resolution: grid spacing in mm
+    bounds:     ((x_min, x_max), (y_min, y_max), (z_min, z_max)) in mm
+    tolerance:  largest interpolation error in degrees a cell may have to
+                be answered from the table
+    '''
+
+    def __init__(self, directory, resolution=4, bounds=BOUNDS, path=None, a=A, b=B, c=C, tolerance=0.5):
+        self.resolution = resolution
+        self.bounds = bounds
+        self.tolerance = tolerance
+        self.a, self.b, self.c = a, b, c
+        if path is None:
+            path = os.path.join(directory, 'ik_table_%smm.npy'%resolution)
+        self.path = path
+        self.error_path = os.path.splitext(path)[0] + '_error.npy'
+
+        self.low = np.array([low for low, _ in bounds], dtype=float)
+        self.shape = tuple(int(round((high - low) / resolution)) + 1 for low, high in bounds)
+        self.high = self.low + (np.array(self.shape) - 1) * resolution
+        # plain floats for the scalar path
+        self._low = [float(v) for v in self.low]
+        self._last = [n - 2 for n in self.shape]
+
+        self.table, self.cell_error = self.load()
+        # cells answered by the exact solution
+        self.exact = np.asarray(self.cell_error > tolerance)
+
+    def grid(self, axis):
+        return self.low[axis] + np.arange(self.shape[axis]) * self.resolution
+
+    def build(self):
+        table = np.empty(self.shape + (3,), dtype=np.float32)
+        ys, zs = np.meshgrid(self.grid(1), self.grid(2), indexing='ij')
+        for i, x in enumerate(self.grid(0)):
+            # one x slice at a time, as (N, 1, 3) "frames" of a single leg
+            coords = np.stack((np.full(ys.size, x), ys.ravel(), zs.ravel()), axis=-1)[:, np.newaxis]
+            angles = coord2polar_batch(coords, self.a, self.b, self.c)
+            # servo order is [beta, alpha, gamma], store coord2polar order
+            table[i] = angles[:, [1, 0, 2]].reshape(self.shape[1], self.shape[2], 3)
+        return table
+
+    def build_error(self, table):
+        '''
+        Max interpolation error of each cell in degrees, checked on a 3x3x3
+        grid of points inside it
+        '''
+        cells = tuple(n - 1 for n in self.shape)
+        error = np.empty(cells, dtype=np.float32)
+        points = (1/6, 1/2, 5/6)
+        offsets = np.array([[u, v, w] for u in points for v in points for w in points])
+        j, k = np.meshgrid(np.arange(cells[1]), np.arange(cells[2]), indexing='ij')
+        for i in range(cells[0]):
+            index = np.stack((np.full(j.size, i), j.ravel(), k.ravel()), axis=-1)
+            # (cells, offsets, 3), cell index and position inside it
+            index = np.repeat(index[:, np.newaxis], len(offsets), axis=1)
+            t = np.broadcast_to(offsets, index.shape)
+            coords = self.low + (index + t) * self.resolution
+            exact = coord2polar_batch(coords.reshape(-1, 1, 3), self.a, self.b, self.c)[:, [1, 0, 2]]
+            approx = interpolate(table, index, t).reshape(-1, 3)
+            cell = np.abs(exact - approx).reshape(len(index), -1).max(axis=-1)
+            error[i] = cell.reshape(cells[1], cells[2])
+        return error
+
+    def load(self):
+        if os.path.exists(self.path) and os.path.exists(self.error_path):
+            table = np.load(self.path, mmap_mode='r')
+            error = np.load(self.error_path)
+            if table.shape == self.shape + (3,) and error.shape == tuple(n - 1 for n in self.shape):
+                return table, error
+        table = self.build()
+        error = self.build_error(table)
+        try:
+            np.save(self.path, table)
+            np.save(self.error_path, error)
+            return np.load(self.path, mmap_mode='r'), error
+        except OSError as e:
+            print('IK table not saved, %s'%e)
+            return table, error
+
+    def coord2polar(self, coord):
+        x, y, z = clamp_radius(*coord, a=self.a, b=self.b, c=self.c)
+        res = self.resolution
+        # cell index and position inside the cell along each axis
+        index = []
+        frac = []
+        for value, low, last in zip((x, y, z), self._low, self._last):
+            f = (value - low) / res
+            if f < 0 or f > last + 1:
+                return coord2polar(coord, self.a, self.b, self.c)
+            i = int(f)
+            if i > last:
+                i, f = last, 1.0
+            else:
+                f = f - i
+            index.append(i)
+            frac.append(f)
+        i, j, k = index
+        if self.exact[i, j, k]:
+            return coord2polar(coord, self.a, self.b, self.c)
+        tx, ty, tz = frac
+
+        # plain python on the 8 corners is faster than numpy for one point
+        (c000, c001), (c010, c011) = self.table[i, j:j+2, k:k+2].tolist()
+        (c100, c101), (c110, c111) = self.table[i+1, j:j+2, k:k+2].tolist()
+        angles = []
+        for n in range(3):
+            c00 = c000[n] + (c100[n] - c000[n]) * tx
+            c01 = c001[n] + (c101[n] - c001[n]) * tx
+            c10 = c010[n] + (c110[n] - c010[n]) * tx
+            c11 = c011[n] + (c111[n] - c011[n]) * tx
+            c0 = c00 + (c10 - c00) * ty
+            c1 = c01 + (c11 - c01) * ty
+            angles.append(round(c0 + (c1 - c0) * tz, 4))
+        return angles
+
+    def coord2polar_batch(self, coords):
+        '''
+        Table version of kinematics.coord2polar_batch, (N, 4, 3) -> (N, 12)
+        '''
+        coords = np.asarray(coords, dtype=float)
+        if coords.ndim == 2:
+            coords = coords[np.newaxis]
+        f = (clamp_radius_batch(coords, self.a, self.b, self.c) - self.low) / self.resolution
+        outside = ((f < 0) | (f > np.array(self._last) + 1)).any(axis=-1)
+        index = np.clip(f.astype(int), 0, np.array(self._last))
+        t = np.clip(f - index, 0, 1)
+        angles = interpolate(self.table, index, t)
+        exact = outside | self.exact[index[..., 0], index[..., 1], index[..., 2]]
+        if exact.any():
+            solved = coord2polar_batch(coords[exact][:, np.newaxis], self.a, self.b, self.c)
+            angles[exact] = solved[:, [1, 0, 2]]
+        angles = angles[..., [1, 0, 2]]
+        return np.round(angles, 4).reshape(len(coords), -1)
+
+    def error_report(self, samples=100000, seed=0, margin=60):
+        '''
+        Compare the table against the exact solution at random points of the
+        box widened by margin mm on every side, after limit_angle like the
+        servos see it.
+
+        return: dict with max / mean / 99th percentile error in degrees over
+                the points inside the servo limits, and the max error over
+                all points (max_error_all), which also covers the angles
+                limit_angle cuts off
+        '''
+        rng = np.random.default_rng(seed)
+        # 4 legs per frame, limit_angle_batch works on whole frames
+        coords = rng.uniform(self.low - margin, self.high + margin, (samples // 4 + 1, 4, 3))
+        flags, exact = limit_angle_batch(coord2polar_batch(coords, self.a, self.b, self.c))
+        _, approx = limit_angle_batch(self.coord2polar_batch(coords))
+        error_all = np.abs(exact - approx).reshape(-1, 3).max(axis=-1)
+        error = error_all[~flags.ravel()]
+        return {
+            'resolution': self.resolution,
+            'samples': len(error),
+            'max_error': float(error.max()),
+            'mean_error': float(error.mean()),
+            'p99_error': float(np.percentile(error, 99)),
+            'max_error_all': float(error_all.max()),
+            'exact_cells': float(self.exact.mean()),
+            'size_mb': (self.table.nbytes + self.cell_error.nbytes) / 1e6,
+        }
+
+
+def interpolate(table, index, t):
+    # trilinear interpolation of table at cells index (..., 3) and positions t (..., 3) inside them
+    i, j, k = index[..., 0], index[..., 1], index[..., 2]
+    tx, ty, tz = (t[..., n, np.newaxis] for n in range(3))
+    c00 = table[i, j, k] * (1 - tx) + table[i+1, j, k] * tx
+    c01 = table[i, j, k+1] * (1 - tx) + table[i+1, j, k+1] * tx
+    c10 = table[i, j+1, k] * (1 - tx) + table[i+1, j+1, k] * tx
+    c11 = table[i, j+1, k+1] * (1 - tx) + table[i+1, j+1, k+1] * tx
+    c0 = c00 * (1 - ty) + c10 * ty
+    c1 = c01 * (1 - ty) + c11 * ty
+    return c0 * (1 - tz) + c1 * tz
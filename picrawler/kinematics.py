@@ -0,0 +1,175 @@
+import math
+import numpy as np
+import time
+
+# leg segment lengths, same as Picrawler.A / B / C
+A = 48
+B = 78
+C = 33
+
+U_MIN = 30
+U_MAX = 91.58
+
+def clamp_radius(x, y, z, a=A, b=B, c=C):
+    # scale [x, y, z] onto [C, A+B+C] from the leg root, like coord2polar
+    L = math.sqrt(x**2 + y**2 + z**2)
+    if L == 0:
+        L = 0.1
+    if L < c:
+        temp = c/L
+    elif L > (a+b+c):
+        temp = (a+b+c)/L
+    else:
+        return x, y, z
+    return temp * x, temp * y, temp * z
+
+def coord2polar(coord, a=A, b=B, c=C):
+    '''
+    Picrawler.coord2polar for one leg: [x, y, z] -> [alpha, beta, gamma]
+    '''
+    x, y, z = clamp_radius(*coord, a=a, b=b, c=c)
+
+    w = math.sqrt(x**2 + y**2)
+    v = w - c
+    u = math.sqrt(z**2 + v**2)
+    u = max(U_MIN, min(U_MAX, u))
+    beta = math.acos((b**2 + a**2 - u**2) / (2 * b * a))
+
+    angle1 = math.atan2(z, v)
+    angle2 = math.acos((a**2 + u**2 - b**2) / (2 * a * u))
+    alpha = angle2 + angle1
+
+    gamma = math.atan2(y, x)
+
+    alpha = 90 - alpha / math.pi * 180
+    beta = beta / math.pi * 180 - 90
+    gamma = -(gamma / math.pi * 180 - 45)
+
+    return [round(alpha, 4), round(beta, 4), round(gamma, 4)]
+
+def clamp_radius_batch(coords, a=A, b=B, c=C):
+    # clamp_radius of every leg, (..., 3) -> (..., 3)
+    coords = np.asarray(coords, dtype=float)
+    L = np.sqrt((coords**2).sum(axis=-1))
+    L = np.where(L == 0, 0.1, L)
+    temp = np.ones_like(L)
+    temp = np.where(L < c, c/L, temp)
+    temp = np.where(L > (a+b+c), (a+b+c)/L, temp)
+    return coords * temp[..., np.newaxis]
+
+def coord2polar_batch(coords, a=A, b=B, c=C):
+    '''
+    Vectorized version of Picrawler.coord2polar for whole gait sequences.
+
+    coords: array-like, shape (N, 4, 3), foot coordinates [x, y, z] of the
+            4 legs for N frames (a single (4, 3) step is also accepted)
+    return: ndarray, shape (N, 12), servo angles in the order do_step sends
+            them to set_angle, [beta, alpha, gamma] for each leg
+    '''
+    coords = np.asarray(coords, dtype=float)
+    if coords.ndim == 2:
+        coords = coords[np.newaxis]
+    # clamp the radius into [C, A+B+C]
+    coords = clamp_radius_batch(coords, a, b, c)
+    x = coords[..., 0]
+    y = coords[..., 1]
+    z = coords[..., 2]
+
+    w = np.sqrt(x**2 + y**2)
+    v = w - c
+    u = np.sqrt(z**2 + v**2)
+    u = np.clip(u, U_MIN, U_MAX)
+    beta = np.arccos((b**2 + a**2 - u**2) / (2 * b * a))
+
+    angle1 = np.arctan2(z, v)
+    angle2 = np.arccos((a**2 + u**2 - b**2) / (2 * a * u))
+    alpha = angle2 + angle1
+
+    gamma = np.arctan2(y, x)
+
+    alpha = 90 - alpha / np.pi * 180
+    beta = beta / np.pi * 180 - 90
+    gamma = -(gamma / np.pi * 180 - 45)
+
+    # same servo order as do_step: [beta, alpha, gamma] per leg
+    angles = np.stack((beta, alpha, gamma), axis=-1)
+    return np.round(angles, 4).reshape(len(coords), -1)
+
+# per servo limits of Picrawler.limit_angle, in servo order
+ANGLE_MIN = np.array([-90, -10, -60] * 4, dtype=float)
+ANGLE_MAX = np.array([90, 90, 60] * 4, dtype=float)
+
+def limit_angle_batch(angles):
+    '''
+    Vectorized version of Picrawler.limit_angle.
+
+    angles: array-like, shape (N, 12)
+    return: (limit_flags, angles), limit_flags has shape (N, 4) and is True
+            for each leg that had to be clamped
+    '''
+    angles = np.asarray(angles, dtype=float)
+    if angles.ndim == 1:
+        angles = angles[np.newaxis]
+    limited = np.clip(angles, ANGLE_MIN, ANGLE_MAX)
+    flags = (limited != angles).reshape(len(angles), 4, 3).any(axis=-1)
+    return flags, limited
+
+def polar2coord_batch(angles, a=A, b=B, c=C):
+    '''
+    Vectorized version of Picrawler.polar2coord.
+
+    angles: array-like, shape (N, 12), servo angles in set_angle order
+    return: ndarray, shape (N, 4, 3), foot coordinates [x, y, z] of each leg
+    '''
+    angles = np.asarray(angles, dtype=float)
+    if angles.ndim == 1:
+        angles = angles[np.newaxis]
+    angles = angles.reshape(len(angles), 4, 3)
+    alpha = angles[..., 0]
+    beta = angles[..., 1]
+    gamma = angles[..., 2]
+
+    L1 = np.sqrt(a**2 + b**2 - 2*a*b*np.cos((90+alpha)/180*np.pi))
+    # clip against rounding noise, acos would return nan just outside [-1, 1]
+    angle = np.arccos(np.clip((a**2 + L1**2 - b**2)/(2*a*L1), -1, 1))*180/np.pi
+    angle = 90 - beta - angle
+    L = L1*np.cos(angle*np.pi/180) + c
+
+    x = L*np.sin((45+gamma)*np.pi/180)
+    y = L*np.cos((45+gamma)*np.pi/180)
+    z = L1*np.sin(angle*np.pi/180)
+
+    return np.round(np.stack((x, y, z), axis=-1), 4)
+
+def check_roundtrip(coords, limit=True, tol=0.5, a=A, b=B, c=C):
+    '''
+    Solve coords with coord2polar_batch and reconstruct them with
+    polar2coord_batch, reporting how far the feet end up from where they
+    were asked to go.
+
+    coords: array-like, shape (N, 4, 3)
+    limit:  apply limit_angle_batch before the forward kinematics, like
+            set_angle does before the servos move
+    tol:    error in mm above which a leg is counted as unreachable
+    return: dict with the per-leg error array (N, 4), max / mean error, the
+            number of legs off by more than tol and the solve time in ms
+    '''
+    coords = np.asarray(coords, dtype=float)
+    if coords.ndim == 2:
+        coords = coords[np.newaxis]
+    start = time.perf_counter()
+    angles = coord2polar_batch(coords, a, b, c)
+    if limit:
+        _, angles = limit_angle_batch(angles)
+    result = polar2coord_batch(angles, a, b, c)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    error = np.linalg.norm(result - coords, axis=-1)
+    return {
+        'error': error,
+        'max_error': float(error.max()) if error.size else 0.0,
+        'mean_error': float(error.mean()) if error.size else 0.0,
+        'out_of_range': int((error > tol).sum()),
+        'frames': len(coords),
+        'time_ms': elapsed,
+    }
@@ -1,7 +1,31 @@
-from robot_hat import Robot, utils
+try:
+    from robot_hat import Robot, utils
+except ImportError:
+    # no robot_hat, only the simulated backend can be used
+    from .backend import SimRobot as Robot
+    utils = None
+from .backend import SimBackend
+from .actions import ActionRegistry, normalize
+from .compiled import load_action
+from .control_loop import ControlLoop
+from .executor import MotionExecutor, MotionCancelled
+from .gait import LRUCache, VelocityWalker, generate, quantize
+from .ik_table import IKTable
+from .plugins import GROUP, discover
+from . import presets
+from .profiler import StageProfiler
+from .recording import Recorder, keyframes, load_recording, sample
+from .state import BodyState
+from .telemetry import Telemetry
+from .trajectory import plan
+from . import transition
+from .kinematics import coord2polar, coord2polar_batch, polar2coord_batch, limit_angle_batch, check_roundtrip
 
+import os
 import time
+import threading
 import math
+import numpy as np
 
 class Picrawler(Robot):
     A = 48
@@ -10,12 +34,47 @@ class Picrawler(Robot):
     OFFSET_FILE = '/opt/picrawler/picrawler.config'
     PIN_LIST = [9, 10, 11, 3, 4, 5, 0, 1, 2, 6, 7, 8]
 
-    def __init__(self, pin_list=PIN_LIST, init_angles=None):  
+    BACKENDS = ('hat', 'sim')
+    # limit flag of each leg in the telemetry / solve_steps bit masks
+    LEG_BITS = (1, 2, 4, 8)
 
-        utils.reset_mcu()
-        time.sleep(0.2)
+    def __init__(self, pin_list=PIN_LIST, init_angles=None, backend=None, telemetry=2048, plugins=True):
+        '''
+        backend:   'hat' for the Robot HAT, 'sim' or a backend.SimBackend for the
+                   simulation, default from the PICRAWLER_BACKEND environment
+                   variable, else 'hat'
+        telemetry: number of frames kept in the telemetry ring buffer, None or 0
+                   to record nothing, see enable_telemetry
+        plugins:   register the actions of the installed action packs, see
+                   load_plugins
+        '''
+        if backend is None:
+            backend = os.environ.get('PICRAWLER_BACKEND', 'hat')
+        if isinstance(backend, SimBackend):
+            self.sim = backend
+        elif backend == 'sim':
+            self.sim = SimBackend()
+        elif backend == 'hat':
+            self.sim = None
+        else:
+            raise ValueError('Unknown backend %s, use one of %s'%(backend, self.BACKENDS))
+
+        # write coalescing, see servo_write
+        self.write_deadband = 0
+        # whole frames as block writes, simulator only (the HAT has no block write), see servo_write_raw
+        self.batch_writes = self.sim is not None and self.sim.batch
+        self.last_written = [None] * len(pin_list)
+        self.reset_write_stats()
 
-        super().__init__(pin_list, db=self.OFFSET_FILE, name='picrawler', init_angles=init_angles)
+        if self.sim is not None:
+            self.sim.attach(self, pin_list, name='picrawler', init_angles=init_angles)
+        else:
+            if utils is None:
+                raise ImportError('robot_hat is not installed, use Picrawler(backend="sim")')
+            utils.reset_mcu()
+            time.sleep(0.2)
+
+            super().__init__(pin_list, db=self.OFFSET_FILE, name='picrawler', init_angles=init_angles)
 
         self.move_list = self.MoveList()
         self.move_list_add = {
@@ -27,6 +86,17 @@ class Picrawler(Robot):
             "sit": self.move_list['sit'],
         }
 
+        # every action do_action can run, gaits first so they keep their names
+        self.actions = ActionRegistry()
+        for name, gait in self.MoveList.GAITS.items():
+            self.actions.register(name, ActionRegistry.GAIT, gait)
+        self.actions.register_steps(self.move_list_add, override=False)
+        self.actions.register_steps(self.step_list, override=False)
+        # actions of installed packs, imported on first use
+        self.plugins = {}
+        if plugins:
+            self.load_plugins()
+
         self.stand_position = 0
         self.direction = [
             1,1,-1,
@@ -35,46 +105,132 @@ class Picrawler(Robot):
             1,1,1,
         ]
 
-        self.current_coord = [[60, 0, -30], [60, 0, -30], [60, 0, -30], [60, 0, -30]]
+        # foot coords and commanded angles, current_coord reads and writes it
+        self.state = BodyState([[60, 0, -30], [60, 0, -30], [60, 0, -30], [60, 0, -30]])
         self.coord_temp = [[60, 0, -30], [60, 0, -30], [60, 0, -30], [60, 0, -30]]
 
+        # optional lookup table IK, see use_ik_table
+        self.ik_table = None
+
+        # background motions, see submit
+        self.executor = None
+        self.cancel_event = threading.Event()
+        # last fixed rate loop, see do_trajectory
+        self.control_loop = None
+        # per stage timing, see enable_profiling
+        self.profiler = None
+        # last frames sent to the servos, see enable_telemetry
+        self.telemetry = Telemetry(telemetry) if telemetry else None
+        # motion recording file, see start_recording
+        self.recorder = None
+
+        # compiled gaits, see compile_action
+        self.gait_cache = {}
+        self.gait_signature = None
+        # compiled parametric gaits, see compile_gait
+        self.gait_tables = LRUCache(32)
+        # velocity command walking, see walk
+        self.walker = None
+        self.walk_loop = None
+        # compiled preset actions, see presets.library
+        self.presets = None
+
+    @property
+    def current_coord(self):
+        # a new nested list every time, changing it does not move the legs
+        return self.state.legs()
+
+    @current_coord.setter
+    def current_coord(self, coords):
+        self.state.set_coords(coords)
+
+    def use_ik_table(self, resolution=4, path=None):
+        '''
+        Answer coord2polar and coord2polar_batch (do_step, do_action, gaits,
+        presets) from a precomputed grid (ik_table.IKTable) stored next to
+        OFFSET_FILE. resolution=None goes back to the exact solution. The
+        compiled gaits are dropped, they are solved again with the new IK.
+        The lookup is not faster than the exact solution in CPython, about
+        2x slower for a single point and 4x for a whole gait, it trades
+        accuracy (see the error report, within about 1 degree) for no
+        trigonometry at runtime in most of the workspace.
+
+        return: the table's error report against the exact solution
+        '''
+        self.gait_cache.clear()
+        if resolution is None:
+            self.ik_table = None
+            return None
+        self.ik_table = IKTable(os.path.dirname(self.OFFSET_FILE), resolution, path=path, a=self.A, b=self.B, c=self.C)
+        return self.ik_table.error_report()
+
     def coord2polar(self, coord):
-        x,y,z = coord
-        
-        L = math.sqrt(x**2+y**2+z**2)
-        if L == 0:
-            L = 0.1
-        if L < self.C:
-            temp = self.C/L
-            x = temp * x
-            y = temp * y
-            z = temp * z           
-        elif L > (self.A+self.B+self.C):
-            temp = (self.A+self.B+self.C)/L
-            x = temp * x
-            y = temp * y
-            z = temp * z   
-
-        self.coord_temp.append([x,y,z])
-
-        w = math.sqrt(math.pow(x,2) + math.pow(y,2))
-        v = w - self.C
-        u = math.sqrt(math.pow(z,2) + math.pow(v,2))
-        u = max(30, min(91.58, u))
-        cos_angle1 = (self.B**2 + self.A**2 - u**2) / (2 * self.B * self.A)
-        beta = math.acos(cos_angle1)
-
-        angle1 = math.atan2(z, v)
-        angle2 = math.acos((self.A**2 + u**2 - self.B**2)/(2*self.A*u))
-        alpha = angle2 + angle1
-
-        gamma = math.atan2(y, x)
-
-        alpha = 90 - alpha / math.pi * 180
-        beta = beta / math.pi * 180 - 90
-        gamma = -(gamma / math.pi * 180 - 45) 
-
-        return [round(alpha,4), round(beta,4), round(gamma,4)]
+        if self.ik_table is not None:
+            return self.ik_table.coord2polar(coord)
+        return coord2polar(coord, self.A, self.B, self.C)
+
+    def servo_move(self, targets, speed=50, bpm=None):
+        if self.sim is not None:
+            return self.sim.servo_move(self, targets, speed, bpm)
+        return super().servo_move(targets, speed, bpm)
+
+    def servo_write(self, index, angle):
+        '''
+        Write one servo, unless it is within write_deadband degrees of what
+        was last written to it. write_deadband None writes every time.
+        Writes of servo_list[i].angle() made directly are not seen, go
+        through here to keep last_written right.
+        '''
+        if self.needs_write(index, angle):
+            self.servo_list[index].angle(angle)
+
+    def needs_write(self, index, angle):
+        # whether servo index has to be written, counted and remembered as written if so
+        last = self.last_written[index]
+        if self.write_deadband is not None and last is not None and abs(angle - last) <= self.write_deadband:
+            self.writes_saved += 1
+            return False
+        self.last_written[index] = angle
+        self.writes_sent += 1
+        return True
+
+    def servo_write_raw(self, angle_list):
+        '''
+        servo_write_all and servo_move end up here. Only the changed channels
+        are written, with batch_writes in as few block writes as the channel
+        numbers allow (one for PIN_LIST), else one write per servo.
+
+        Block writes are simulated only: robot_hat writes one PWM register
+        per I2C transaction and the HAT firmware is not known to take a
+        block over consecutive channel registers, so on the real robot
+        every changed servo is still its own transaction, batch_writes or
+        not. The deadband (write_deadband) is what saves bus traffic there.
+        '''
+        if self.batch_writes and self.sim is not None:
+            indexes = [i for i in range(self.pin_num) if self.needs_write(i, angle_list[i])]
+            if indexes:
+                self.sim.write_servos(self, indexes, [angle_list[i] for i in indexes])
+            return
+        for i in range(self.pin_num):
+            self.servo_write(i, angle_list[i])
+
+    def reset_write_stats(self):
+        self.writes_sent = 0
+        self.writes_saved = 0
+
+    def invalidate_writes(self):
+        # the next write of every servo goes out, whatever the deadband
+        self.last_written = [None] * len(self.last_written)
+
+    def set_offset(self, offset_list):
+        super().set_offset(offset_list)
+        self.invalidate_writes()
+
+    def coord2polar_batch(self, coords):
+        # solve a whole sequence of steps, (N, 4, 3) coords -> (N, 12) angles
+        if self.ik_table is not None:
+            return self.ik_table.coord2polar_batch(coords)
+        return coord2polar_batch(coords, self.A, self.B, self.C)
 
     def polar2coord(self, angles):
         alpha, beta, gamma = angles
@@ -90,6 +246,37 @@ class Picrawler(Robot):
     
         return [round(x,4),round(y,4),round(z,4)]
 
+    def polar2coord_batch(self, angles):
+        # reconstruct foot positions, (N, 12) angles -> (N, 4, 3) coords
+        return polar2coord_batch(angles, self.A, self.B, self.C)
+
+    def check_action(self, motion_name, limit=True, tol=0.5):
+        # FK(IK(x)) vs x over every frame of an action, see kinematics.check_roundtrip
+        entry = self.actions.get(motion_name)
+        kind, action = entry if entry is not None else (None, None)
+        name = normalize(motion_name)
+        # preset actions are functions, their frames come from the declaration
+        if kind in (None, ActionRegistry.FUNCTION):
+            if name in presets.GAIT_ACTIONS:
+                kind, action = ActionRegistry.GAIT, presets.GAIT_ACTIONS[name][0]
+            elif name in presets.STEP_ACTIONS:
+                kind, action = ActionRegistry.STEPS, presets.library(self).steps(name)
+            elif kind is None:
+                raise KeyError('No such action: %s'%motion_name)
+            else:
+                raise TypeError('%s is a function action, it has no frames'%motion_name)
+        if kind == ActionRegistry.GAIT:
+            # building a gait changes z_current / ready_state, so restore them afterwards
+            state = (self.move_list.z_current, self.move_list.ready_state)
+            self.move_list.stand_position = self.stand_position
+            frames = list(self.move_list[action])
+            self.move_list.z_current, self.move_list.ready_state = state
+        elif kind == ActionRegistry.COMPILED:
+            frames = action[1]
+        else:
+            frames = np.array(action, dtype=float).reshape(-1, 4, 3)
+        return check_roundtrip(frames, limit, tol, self.A, self.B, self.C)
+
     def limit(self,min,max,x):
         if x > max:
             return max
@@ -122,31 +309,345 @@ class Picrawler(Robot):
         # print('output: %s'%[alpha,beta,gamma])
         return limit_flag,[alpha,beta,gamma]
 
-    def do_action(self, motion_name, step=1, speed=50):
-        try:
-            for _ in range(step): # times
+    def solve_steps(self, steps):
+        '''
+        What do_step does to a list of steps, in one batch: IK, limit_angle and,
+        for the frames that hit the limits, the polar2coord fallback.
+
+        return: (angles, coords, limit_flags), angles (N, 12) as sent to
+                servo_move, coords (N, 4, 3) the current_coord after each frame
+                and limit_flags (N,) the bit mask of the limited legs (bit 0 =
+                leg 0), 0 when no leg was limited
+        '''
+        frames = np.array(steps, dtype=float).reshape(-1, 4, 3)
+        flags, angles = limit_angle_batch(self.coord2polar_batch(frames))
+        flags = (flags * self.LEG_BITS).sum(axis=1).astype(np.uint8)
+        # like set_angle, the legs end up where the limited angles put them
+        coords = frames.copy()
+        limited = flags > 0
+        if limited.any():
+            coords[limited] = self.polar2coord_batch(angles[limited])
+        return angles, coords, flags
+
+    def gait_key(self, motion_name):
+        # gait_cache key of motion_name in the current MoveList state
+        move_list = self.move_list
+        signature = move_list.signature()
+        if signature != self.gait_signature:
+            self.gait_cache.clear()
+            self.gait_signature = signature
+        return (motion_name, move_list.stand_position, move_list.z_current, move_list.ready_state, move_list.angle)
+
+    def compile_action(self, motion_name):
+        '''
+        Solve a MoveList gait into its final servo-angle table, once per
+        (gait, stand_position, z_current, ready_state, angle). The cache is
+        cleared when the MoveList constants change.
+
+        return: (angles, coords, limit_flags, state), angles (N, 12) as sent to
+                servo_move, coords (N, 4, 3) the current_coord after each frame,
+                limit_flags (N,) leg bit masks and the (z_current, ready_state) the MoveList is
+                left in after building the gait
+        '''
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter_ns()
+        move_list = self.move_list
+        key = self.gait_key(motion_name)
+        compiled = self.gait_cache.get(key)
+        if compiled is None:
+            angles, coords, flags = self.solve_steps(move_list.array(motion_name))
+            compiled = (angles, coords, flags, (move_list.z_current, move_list.ready_state))
+            self.gait_cache[key] = compiled
+        else:
+            # building the gait would have changed these, keep the same behavior
+            move_list.z_current, move_list.ready_state = compiled[3]
+        if profiler is not None:
+            profiler.add(profiler.COMPILE, time.perf_counter_ns() - start)
+        return compiled
+
+    def compile_gait(self, gait='forward', stride=45, lift=20, height=50, duty=0.75, turn=20, frames=16):
+        '''
+        Servo-angle table of a parametric gait cycle, see gait.generate. The
+        parameters are rounded to gait.QUANTUM steps and the last 32 tables
+        are kept in gait_tables.
+
+        return: (angles, coords, limit_flags, None), like compile_action
+        '''
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter_ns()
+        key = quantize(gait=gait, stride=stride, lift=lift, height=height, duty=duty, turn=turn, frames=frames)
+        compiled = self.gait_tables.get(key)
+        if compiled is None:
+            angles, coords, flags = self.solve_steps(generate(**dict(key)))
+            compiled = (angles, coords, flags, None)
+            self.gait_tables.put(key, compiled)
+        if profiler is not None:
+            profiler.add(profiler.COMPILE, time.perf_counter_ns() - start)
+        return compiled
+
+    def do_gait(self, gait='forward', step=1, speed=50, blend=False, **params):
+        '''
+        Walk step cycles of a parametric gait.
+
+        gait:   'forward', 'backward', 'left', 'right', 'turn_left' or 'turn_right'
+        blend:  start the first cycle from the current feet, see blend
+        params: stride, lift, height, duty, turn, frames, see compile_gait
+        '''
+        compiled = self.compile_gait(gait, **params)
+        for i in range(step):
+            if blend and i == 0:
+                self.do_compiled(self.blend(compiled, params.get('lift', 20)), speed)
+            else:
+                self.do_compiled(compiled, speed)
+
+    def blend(self, compiled, lift=20, cyclic=True):
+        '''
+        A compiled gait entered from where the feet are now: the frames of
+        transition.plan to the gait's entry frame followed by the rest of
+        the gait. The entry frame of a cyclic gait is the one cheapest to
+        reach (transition.nearest_frame), of others the first one.
+
+        return: (angles, coords, limit_flags, state), like compile_action
+        '''
+        angles, coords, flags, state = compiled
+        if not len(angles):
+            return compiled
+        current = self.state.coords
+        start = transition.nearest_frame(current, coords) if cyclic else 0
+        steps = transition.plan(current, coords[start], lift)
+        if not len(steps):
+            return angles[start:], coords[start:], flags[start:], state
+        t_angles, t_coords, t_flags = self.solve_steps(steps)
+        return (np.concatenate((t_angles, angles[start + 1:])), np.concatenate((t_coords, coords[start + 1:])),
+            np.concatenate((t_flags, flags[start + 1:])), state)
+
+    def walk(self, vx=0, vy=0, yaw_rate=0, rate=50, **params):
+        '''
+        Walk at a velocity, new commands take effect on the next control
+        tick. The first call puts the feet in the walker's neutral stance
+        and starts a gait.VelocityWalker on a ControlLoop thread writing one
+        frame per tick, stop_walking ends it. Do not run other actions while
+        walking.
+
+        vx, vy:   mm/s, to the right and forward
+        yaw_rate: deg/s, positive to the left
+        rate:     control rate in Hz, used when the loop is started
+        params:   period, lift, height, duty, max_speed, max_yaw_rate of the
+                  walker, used when the loop is started
+        '''
+        if self.walk_loop is None or not self.walk_loop.running:
+            self.walker = VelocityWalker(**params)
+            stance = self.walker.stance()
+            self.do_step(stance.tolist(), 100)
+            self.walker.reset(stance)
+            self.walker.set_command(vx, vy, yaw_rate)
+            self.walk_loop = ControlLoop(rate)
+            self.walk_loop.start(self.walk_setpoint, lambda setpoint: self.write_setpoint(*setpoint))
+        else:
+            self.walker.set_command(vx, vy, yaw_rate)
+
+    def walk_setpoint(self, tick):
+        # one walking frame, IK and limits like solve_steps
+        coords = self.walker.step(self.walk_loop.period)
+        flags, angles = limit_angle_batch(self.coord2polar_batch(coords))
+        if flags.any():
+            coords = self.polar2coord_batch(angles)[0]
+            self.walker.place(coords)
+        return angles[0].tolist(), coords
+
+    def stop_walking(self):
+        # stops the walking loop where the feet are, call walk(0, 0, 0) first to end in the neutral stance
+        if self.walk_loop is not None:
+            self.walk_loop.stop()
+
+    def do_compiled(self, compiled, speed=50, israise=False):
+        angles, coords, flags, _ = compiled
+        for i in range(len(angles)):
+            self.do_frame(angles[i], coords[i], flags[i], speed, israise)
+
+    def do_frame(self, angles, coords, limit=0, speed=50, israise=False):
+        # send one solved frame, angles (12,) and coords (4, 3) arrays
+        self.check_cancel()
+        if limit and israise == True:
+            raise ValueError('\033[1;35mCoordinates out of controllable range.\033[0m')
+        self.state.set_coords(coords)
+        self.state.set_angles(angles)
+        self.record_frame(coords, angles, speed, limit)
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter_ns()
+        self.servo_move(angles.tolist(), speed)
+        if profiler is not None:
+            profiler.add(profiler.SERVO_MOVE, time.perf_counter_ns() - start)
+            profiler.frame()
+
+    def stream_action(self, motion_name, step=1):
+        '''
+        Generator of the solved frames of an action, (angles, coords, limit)
+        like one row of compile_action, each frame built and solved when it
+        is consumed. Gaits already in gait_cache come from there, the others
+        are added to it once streamed to the end. Function actions have no
+        frames.
+        '''
+        entry = self.actions.get(motion_name)
+        if entry is None:
+            raise KeyError('No such action: %s'%motion_name)
+        kind, action = entry
+        if kind == ActionRegistry.FUNCTION:
+            raise TypeError('%s is a function action, it has no frames'%motion_name)
+        for _ in range(step):
+            if kind == ActionRegistry.GAIT:
+                self.move_list.stand_position = self.stand_position
+                if action in self.MoveList.LOCOMOTION:
+                    self.stand_position = self.stand_position + 1 & 1
+                key = self.gait_key(action)
+                if key in self.gait_cache:
+                    angles, coords, flags, _ = self.compile_action(action)
+                    for i in range(len(angles)):
+                        yield angles[i], coords[i], flags[i]
+                    continue
+                solved = []
+                for frame in self.move_list.stream(action):
+                    solved.append(self.solve_steps(frame))
+                    yield solved[-1][0][0], solved[-1][1][0], solved[-1][2][0]
+                if solved:
+                    angles, coords, flags = (np.concatenate(column) for column in zip(*solved))
+                    self.gait_cache[key] = (angles, coords, flags, (self.move_list.z_current, self.move_list.ready_state))
+            elif kind == ActionRegistry.COMPILED:
+                angles, coords, flags, _ = action
+                for i in range(len(angles)):
+                    yield angles[i], coords[i], flags[i]
+            else:
+                for frame in action:
+                    angles, coords, flags = self.solve_steps(frame)
+                    yield angles[0], coords[0], flags[0]
+
+    def play_compiled(self, action, speed=None, step=1):
+        '''
+        Play a compiled action (compiled.compile_action / .pca file) straight
+        to servo_move, without IK or limit checks.
+
+        action: path of a .pca file or an array of compiled.FRAME
+        speed:  None to use the speed each frame was compiled with
+        '''
+        frames = load_action(action) if isinstance(action, str) else action
+        for _ in range(step):
+            for frame in frames:
+                self.check_cancel()
+                self.state.set_coords(frame['coords'])
+                self.state.set_angles(frame['angles'])
+                frame_speed = float(frame['speed']) if speed is None else speed
+                self.record_frame(frame['coords'], frame['angles'], frame_speed)
+                self.servo_move(frame['angles'].tolist(), frame_speed)
+                if frame['delay'] > 0:
+                    self.sleep(float(frame['delay']))
+
+    def sleep(self, seconds):
+        # time.sleep, on the simulated clock with the sim backend, compile_action captures it
+        if self.sim is not None:
+            self.sim.sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def do_trajectory(self, steps, duration=0.5, rate=50, profile='minimum_jerk', space='joint'):
+        '''
+        Move smoothly through sparse keyframes, starting from current_coord.
+        The setpoints are generated by trajectory.plan and written by a
+        control_loop.ControlLoop with servo_write_all, servo_move's own
+        stepping is not used.
+
+        steps:    list of steps, as passed to do_step
+        duration: seconds per keyframe, a number or one per step
+        rate:     control rate in Hz, 50 - 100
+        profile:  'minimum_jerk', 'cubic' or 'linear', see trajectory.py
+        space:    'joint' or 'cartesian'
+        '''
+        keyframes = [self.current_coord] + list(steps)
+        angles, coords = plan(keyframes, duration, rate, profile, space, self.A, self.B, self.C)
+        # the loop is kept, its stats() show whether the rate was met
+        self.control_loop = ControlLoop(rate)
+        setpoints = angles.tolist()
+        self.control_loop.run(range(len(setpoints)), lambda i: self.write_setpoint(setpoints[i], coords[i]))
+
+    def write_setpoint(self, angles, coords=None):
+        # one control loop tick, no stepping like servo_move
+        self.check_cancel()
+        if coords is None:
+            coords = polar2coord_batch(angles, self.A, self.B, self.C)[0]
+        # kept up to date every tick, a cancelled loop leaves the feet where they are
+        self.state.set_coords(coords)
+        # speed 0: the control loop sets the pace, not servo_move
+        self.record_frame(coords, angles, 0)
+        self.state.set_angles(angles)
+        self.servo_write_all(angles)
+        self.servo_positions = angles
+
+    def do_action(self, motion_name, step=1, speed=50, blend=False, stream=False):
+        '''
+        blend:  gaits start from the current feet instead of their first
+                frame, see blend
+        stream: build and solve the frames while moving, see stream_action,
+                the first frame goes out at once however long the action
+        '''
+        entry = self.actions.get(motion_name)
+        if entry is None:
+            print("No such action")
+            return
+        kind, action = entry
+        if stream and kind != ActionRegistry.FUNCTION and not blend:
+            for angles, coords, limit in self.stream_action(motion_name, step):
+                self.do_frame(angles, coords, limit, speed)
+            return
+        for i in range(step): # times
+            if kind == ActionRegistry.GAIT:
                 self.move_list.stand_position = self.stand_position
-                if motion_name in ["forward", "backward", "turn left", "turn right", "turn left angle", "turn right angle"]:
+                if action in self.MoveList.LOCOMOTION:
                     self.stand_position = self.stand_position + 1 & 1
-                action = self.move_list[motion_name]
-                for _step in action: # spyder motion
+                if blend and i == 0:
+                    self.sync_move_list()
+                    # a MoveList gait moves the body on given frames, entering late would skip them
+                    compiled = self.blend(self.compile_action(action), cyclic=False)
+                else:
+                    compiled = self.compile_action(action)
+                self.do_compiled(compiled, speed=speed)
+            elif kind == ActionRegistry.STEPS:
+                for _step in action:
                     self.do_step(_step, speed=speed)
-        except AttributeError:
-            try:
-                for _ in range(step):
-                    action_add = self.move_list_add[motion_name]
-                    for _step in action_add:
-                        self.do_step(_step, speed=speed) 
-            except KeyError:
-                print("No such action")
+            elif kind == ActionRegistry.COMPILED:
+                self.do_compiled(action, speed=speed)
+            else:
+                action(self)
+
+    def sync_move_list(self):
+        # standing or sitting as the feet are, so gaits do not add a stand or sit the robot is already in
+        move_list = self.move_list
+        z = self.state.coords[:, 2]
+        if z.max() - z.min() < 1:
+            if abs(z[0] - move_list.Z_DEFAULT) < 1:
+                move_list.z_current = move_list.Z_DEFAULT
+                move_list.ready_state = 1
+            elif abs(z[0] - move_list.Z_UP) < 1:
+                move_list.z_current = move_list.Z_UP
 
     def set_angle(self, angles_list, speed=50, israise=False):
+        profiler = self.profiler
+        if profiler is not None:
+            start = time.perf_counter_ns()
         translate_list = []
         results = []
-        for angles in angles_list:
+        limit = 0
+        for i, angles in enumerate(angles_list):
             result, angles = self.limit_angle(angles)
             translate_list += angles
             results.append(result)
+            if result:
+                limit |= self.LEG_BITS[i]
+        if profiler is not None:
+            now = time.perf_counter_ns()
+            profiler.add(profiler.LIMIT, now - start)
+            start = now
         
         if True in results:
             if israise == True:
@@ -158,44 +659,192 @@ class Picrawler(Robot):
                     # Calculate coordinates 
                     for i in range(4):
                         coords.append(self.polar2coord([translate_list[i*3],translate_list[i*3+1],translate_list[i*3+2]]))
-                    self.current_coord = list.copy(coords)
+                    self.state.set_coords(coords)
                 except Exception as e:
                     print('re : %s'%e)
+            if profiler is not None:
+                now = time.perf_counter_ns()
+                profiler.add(profiler.FALLBACK, now - start)
+                start = now
         else:
-            self.current_coord = list.copy(self.coord_temp)
+            self.state.set_coords(self.coord_temp)
+        self.state.set_angles(translate_list)
 
+        self.record_frame(self.state.coords, translate_list, speed, limit)
         self.servo_move(translate_list, speed)  
+        if profiler is not None:
+            profiler.add(profiler.SERVO_MOVE, time.perf_counter_ns() - start)
+            profiler.frame()
         return list.copy(translate_list)
 
     def do_step(self, _step, speed=50, israise=False):
+        profiler = self.profiler
         if isinstance(_step, str):
             if _step in self.step_list.keys():
                 for one_step in self.step_list[_step]:
+                    self.check_cancel()
+                    if profiler is not None:
+                        start = time.perf_counter_ns()
                     angles_temp = []
                     for coord in one_step: # each servo motion    
                         alpha, beta, gamma = self.coord2polar(coord)
                         angles_temp.append([beta, alpha, gamma])
+                    if profiler is not None:
+                        profiler.add(profiler.IK, time.perf_counter_ns() - start)
                     self.coord_temp = list.copy(one_step)
                     self.set_angle(angles_temp, speed, israise)
             else:
                 print("The name of gait is not in the default gait dictionary")
         elif isinstance(_step, list):
+            self.check_cancel()
+            if profiler is not None:
+                start = time.perf_counter_ns()
             angles_temp = []
             for coord in _step: # each servo motion    
                 alpha, beta, gamma = self.coord2polar(coord)
                 angles_temp.append([beta, alpha, gamma])
+            if profiler is not None:
+                profiler.add(profiler.IK, time.perf_counter_ns() - start)
             self.coord_temp = list.copy(_step)
             self.set_angle(angles_temp, speed, israise)
         else:
             print("The \"_step\" parameter is wrong.")
             return
 
+    def enable_profiling(self, log_interval=None, log=print):
+        '''
+        Time every stage of do_step / set_angle / do_action frames, see
+        profiler.StageProfiler. Returns the profiler, its snapshot() gives
+        the numbers. Off (profiler None) costs one attribute check per stage.
+        '''
+        self.profiler = StageProfiler(log_interval, log)
+        return self.profiler
+
+    def disable_profiling(self):
+        self.profiler = None
+
+    def enable_telemetry(self, size=2048):
+        '''
+        Record the last size frames sent to the servos (time, foot coords,
+        angles, speed, limited legs) in a telemetry.Telemetry ring buffer,
+        replacing the current one. Its dump(path) saves them to .npy.
+        '''
+        self.telemetry = Telemetry(size)
+        return self.telemetry
+
+    def disable_telemetry(self):
+        self.telemetry = None
+
+    def record_frame(self, coords, angles, speed, limit=0):
+        # a frame about to be sent, to the telemetry and the recording
+        if self.telemetry is not None:
+            self.telemetry.record(coords, angles, speed, limit)
+        if self.recorder is not None:
+            self.recorder.record(coords, angles, speed)
+
+    def start_recording(self, path):
+        '''
+        Append every frame sent from now on (time, angles, foot coords,
+        speed) to the recording file path, see recording.py. On the
+        simulator the times are on its clock.
+        '''
+        self.stop_recording()
+        clock = self.sim.now if self.sim is not None else time.perf_counter
+        self.recorder = Recorder(path, clock)
+        return self.recorder
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def play_recording(self, recording, speed=1.0, rate=50, interpolate=True):
+        '''
+        Replay a recording on a ControlLoop, setpoints sampled from the
+        recorded motion at rate Hz.
+
+        recording:   path of a recording file, or an array of recording.RECORD
+        speed:       time multiplier, 2.0 plays twice as fast
+        interpolate: move linearly between the recorded frames, as servo_move
+                     did, instead of jumping to each frame when it was sent
+        '''
+        if speed <= 0:
+            raise ValueError('speed must be positive, not %s'%speed)
+        records = load_recording(recording) if isinstance(recording, str) else recording
+        if not len(records):
+            return
+        times, angles, coords = keyframes(records)
+        start, end = times[0], times[-1]
+        step = speed / rate
+
+        def setpoint(tick):
+            t = start + tick * step
+            if t > end + step:
+                return None
+            return t
+
+        def write(t):
+            self.write_setpoint(sample(times, angles, t, interpolate).tolist(), sample(times, coords, t, interpolate))
+
+        self.control_loop = ControlLoop(rate)
+        self.control_loop.run(setpoint, write)
+
+    def check_cancel(self):
+        # called before every frame, stops a motion cancelled through the executor
+        if self.cancel_event.is_set() and threading.current_thread() is self.executor.thread:
+            raise MotionCancelled()
+
+    def submit(self, action, *args, **kwargs):
+        '''
+        Run an action in the background, see executor.MotionExecutor.
+        action is an action name or a function taking the Picrawler, the
+        other arguments go to do_action / the function.
+
+        return: concurrent.futures.Future
+        '''
+        if self.executor is None:
+            self.executor = MotionExecutor(self)
+        return self.executor.submit(action, *args, **kwargs)
+
+    def preempt(self, action, *args, **kwargs):
+        # stop whatever is running or queued and run action next
+        if self.executor is None:
+            self.executor = MotionExecutor(self)
+        return self.executor.preempt(action, *args, **kwargs)
+
+    def cancel(self, future=None):
+        # stop the background motions, or only the one of future
+        if self.executor is not None:
+            self.executor.cancel(future)
 
     def current_step_all_leg_angle(self):
         return list.copy(self.servo_positions)
 
-    def add_action(self,action_name, action_list):
+    def add_action(self,action_name, action_list, override=False):
+        # a name taken by another action (a built-in gait ...) raises unless override=True
+        if not override and action_name not in self.move_list_add and action_name in self.actions:
+            raise ValueError('Action %s already exists, pass override=True to replace it'%action_name)
         self.move_list_add[action_name] = action_list
+        self.actions.register(action_name, ActionRegistry.STEPS, action_list)
+
+    def add_actions(self, actions_dict, override=False):
+        # merge an actions_dict of preset_actions.py style functions, func(spider)
+        self.actions.register_functions(actions_dict, override)
+
+    def load_plugins(self, group=GROUP):
+        '''
+        Register the actions of the installed action packs (entry points of
+        group, see plugins.py) under their entry point names, without
+        importing them. Names already taken are left alone.
+
+        return: the names registered
+        '''
+        names = []
+        for name, plugin in discover(group).items():
+            if self.actions.register_lazy(name, lambda plugin=plugin: plugin.load(self)):
+                self.plugins[name] = plugin
+                names.append(name)
+        return names
 
 
     def cali_helper_web(self, leg, pos, enter):
@@ -219,32 +868,33 @@ class Picrawler(Robot):
         
         offset = list.copy(self.offset)
         leg = leg - 1
+        current_coord = self.current_step_all_leg_value()
         if pos == 'up':
-            self.current_coord[leg][1] += step * positive_list[leg][0]
+            current_coord[leg][1] += step * positive_list[leg][0]
         elif pos == 'down':
-            self.current_coord[leg][1] += step * positive_list[leg][1]
+            current_coord[leg][1] += step * positive_list[leg][1]
         elif pos == 'left':
-            self.current_coord[leg][0] += step * positive_list[leg][2]
+            current_coord[leg][0] += step * positive_list[leg][2]
         elif pos == 'right':
-            self.current_coord[leg][0] += step * positive_list[leg][3]
+            current_coord[leg][0] += step * positive_list[leg][3]
         elif pos == 'high':
-            self.current_coord[leg][2] += step * positive_list[leg][4]
+            current_coord[leg][2] += step * positive_list[leg][4]
         elif pos == 'low':
-            self.current_coord[leg][2] += step * positive_list[leg][5]
+            current_coord[leg][2] += step * positive_list[leg][5]
         
-        for coord in self.current_coord:
+        for coord in current_coord:
             coord[0] = max(40, min(80, coord[0]))
             coord[1] = max(-20, min(20, coord[1]))
             coord[2] = max(-50, min(-10, coord[2]))
-        self.do_step(self.current_coord, speed=100)
-        current_position = list.copy(self.do_step(self.current_coord, speed=100))
+        self.do_step(current_coord, speed=100)
+        current_position = self.state.angles.tolist()
         # print('current_position: %s'%current_position)
         if enter == 1:
             tmp = [current_position[i] - cali_position[i] + offset[i] for i in range(len(current_position))]
             offset[leg*3:(leg + 1)*3] = tmp[leg*3:(leg + 1)*3]
-            self.current_coord[leg] = [60, 0, -30]
+            current_coord[leg] = [60, 0, -30]
             self.set_offset(offset)
-            self.do_step(self.current_coord, speed=100)
+            self.do_step(current_coord, speed=100)
 
 
     class MoveList(dict):
@@ -274,6 +924,109 @@ class Picrawler(Robot):
         TURN_X0 = TURN_X1 - TEMP_B * math.cos(TEMP_ALPHA)
         TURN_Y0 = TEMP_B * math.sin(TEMP_ALPHA) - TURN_Y1 - LENGTH_SIDE
 
+        CONSTANTS = (
+            'LENGTH_SIDE', 'X_DEFAULT', 'X_TURN', 'X_START', 'Y_DEFAULT', 'Y_TURN', 'Y_WAVE', 'Y_START',
+            'Z_DEFAULT', 'Z_UP', 'Z_WAVE', 'Z_TURN', 'Z_PUSH', 'TURN_X1', 'TURN_Y1', 'TURN_X0', 'TURN_Y0',
+        )
+
+        # leg orders of the stand_position 1 gaits, see normal_action
+        LEG_SWAPS = (
+            (1, 0, 3, 2), # mode 0, legs 1 <-> 2, 3 <-> 4
+            (2, 3, 0, 1), # mode 1, legs 1 <-> 3, 2 <-> 4
+        )
+
+        # The gaits are templates of indices into values(), one fancy indexing
+        # values()[TEMPLATE] builds the (N, 4, 3) frames in the current state.
+        (XD, YD, Z, XT, YS, ZU, YD2, XS, YT, ZT, ZP, YW, ZW, ZD, TX1, TY1, TX0, TY0,
+            AX1, AY1, AX2, AY2, AX3, AY3) = range(24)
+
+        SIT = np.array([
+            [[XD, YD, Z], [XT, YS, Z], [XT, YS, Z], [XD, YD, Z]],
+        ])
+        STAND = np.array([
+            [[XD, YD, Z], [XD, YS, Z], [XD, YS, Z], [XD, YD, Z]],
+        ])
+        FORWARD = np.array([
+            [[XD, YD, Z], [XT, YS, ZU], [XD, YS, Z], [XD, YD, Z]],
+            [[XD, YD, Z], [XD, YD2, ZU], [XD, YS, Z], [XD, YD, Z]],
+            [[XD, YD, Z], [XD, YD2, Z], [XD, YS, Z], [XD, YD, Z]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XD, YD2, Z]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XD, YD2, ZU]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XT, YS, ZU]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+        ])
+        BACKWARD = np.array([
+            [[XD, YD, Z], [XD, YS, Z], [XT, YS, ZU], [XD, YD, Z]],
+            [[XD, YD, Z], [XD, YS, Z], [XD, YD2, ZU], [XD, YD, Z]],
+            [[XD, YD, Z], [XD, YS, Z], [XD, YD2, Z], [XD, YD, Z]],
+            [[XD, YD2, Z], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+            [[XD, YD2, ZU], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+            [[XT, YS, ZU], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+        ])
+        TURN_LEFT = np.array([
+            [[XD, YD, Z], [XD, YS, Z], [XT, YS, ZU], [XD, YD, Z]],
+            [[TX1, TY1, Z], [TX1, TY1, Z], [TX0, TY0, ZU], [TX0, TY0, Z]],
+            [[TX1, TY1, Z], [TX1, TY1, Z], [TX0, TY0, Z], [TX0, TY0, Z]],
+            [[TX1, TY1, Z], [TX1, TY1, Z], [TX0, TY0, Z], [TX0, TY0, ZU]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XT, YS, ZU]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+        ])
+        TURN_RIGHT = np.array([
+            [[XD, YD, Z], [XT, YS, ZU], [XD, YS, Z], [XD, YD, Z]],
+            [[TX0, TY0, Z], [TX0, TY0, ZU], [TX1, TY1, Z], [TX1, TX1, Z]],
+            [[TX0, TY0, Z], [TX0, TY0, Z], [TX1, TY1, Z], [TX1, TX1, Z]],
+            [[TX0, TY0, ZU], [TX0, TY0, Z], [TX1, TY1, Z], [TX1, TX1, Z]],
+            [[XT, YS, ZU], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+            [[XD, YS, Z], [XD, YD, Z], [XD, YD, Z], [XD, YS, Z]],
+        ])
+        PUSH_UP = np.array([
+            [[XT, YS, ZT], [XT, YS, ZT], [XS, YT, ZT], [XS, YT, ZT]],
+            [[XT, YS, ZP], [XT, YS, ZP], [XS, YT, ZT], [XS, YT, ZT]],
+        ] * 3 + [
+            [[XT, YS, ZT], [XT, YS, ZT], [XS, YT, ZT], [XS, YT, ZT]],
+        ])
+        WAVE = np.array([
+            [[XD, YD, Z], [XT, YS, ZU], [XD, YS, Z], [XD, YD, Z]],
+        ] + [
+            [[XD, YD, Z], [XS, YW, ZW], [XD, YS, Z], [XD, YD, Z]],
+            [[XD, YD, Z], [XS, YW, ZU], [XD, YS, Z], [XD, YD, Z]],
+        ] * 3 + [
+            [[XD, YD, Z], [XT, YS, ZU], [XD, YS, Z], [XD, YD, Z]],
+            [[XD, YD, Z], [XD, YS, Z], [XD, YS, Z], [XD, YD, Z]],
+        ])
+        LOOK_LEFT = np.array([
+            [[XD, YD, Z], [XD, YS, Z], [XT, YS, ZU], [XD, YD, Z]],
+            [[AX1, AY1, Z], [AX2, AY2, Z], [XT, YS, ZU], [AX3, AY3, Z]],
+        ])
+        LOOK_RIGHT = np.array([
+            [[XD, YD, Z], [XT, YS, ZU], [XD, YS, Z], [XD, YD, Z]],
+            [[AX3, AY3, Z], [XT, YS, ZU], [AX2, AY2, Z], [AX1, AY1, Z]],
+        ])
+        TURN_LEFT_ANGLE = np.array([
+            [[XD, YD, Z], [XD, YS, Z], [XT, YS, ZU], [XD, YD, Z]],
+            [[AX1, AY1, Z], [AX2, AY2, Z], [XT, YS, ZU], [AX3, AY3, Z]],
+            [[AX1, AY1, Z], [AX2, AY2, Z], [XD, YD, Z], [AX3, AY3, Z]],
+            [[AX1, AY1, Z], [AX2, AY2, Z], [XD, YD, Z], [AX3, AY3, ZU]],
+            [[AX1, AY1, Z], [AX2, AY2, Z], [XT, YD, Z], [XT, YS, ZU]],
+            [[AX1, AY1, Z], [AX2, AY2, Z], [XT, YD, Z], [XD, YS, Z]],
+        ])
+        TURN_RIGHT_ANGLE = np.array([
+            [[XD, YD, Z], [XT, YS, ZU], [XD, YS, Z], [XD, YD, Z]],
+            [[AX3, AY3, Z], [XT, YS, ZU], [AX2, AY2, Z], [AX1, AY1, Z]],
+            [[AX3, AY3, Z], [XD, YD, Z], [AX2, AY2, Z], [AX1, AY1, Z]],
+            [[AX3, AY3, ZU], [XD, YD, Z], [AX2, AY2, Z], [AX1, AY1, Z]],
+            [[XT, YS, ZU], [XD, YD, Z], [AX2, AY2, Z], [AX1, AY1, Z]],
+            [[XD, YS, Z], [XD, YD, Z], [AX2, AY2, Z], [AX1, AY1, Z]],
+        ])
+        LOOK_UP = np.array([
+            [[XD, YD, ZD], [XD, YS, ZD], [XT, YS, ZU], [XD, YD, ZU]],
+        ])
+        LOOK_DOWN = np.array([
+            [[XD, YD, ZU], [XT, YS, ZU], [XD, YS, Z], [XD, YD, Z]],
+        ])
+        del XD, YD, Z, XT, YS, ZU, YD2, XS, YT, ZT, ZP, YW, ZW, ZD, TX1, TY1, TX0, TY0, AX1, AY1, AX2, AY2, AX3, AY3
+
         def __init__(self, *args, **kwargs):
             dict.__init__(self, *args, **kwargs)
             self.z_current = self.Z_UP
@@ -283,7 +1036,48 @@ class Picrawler(Robot):
             self.angle = 30
    
         def __getitem__(self, item):
-            return eval("self.%s"%item.replace(" ", "_"))
+            return getattr(self, self.gait_name(item))
+
+        def gait_name(self, item):
+            name = self.GAITS.get(item)
+            if name is None:
+                name = self.GAITS[normalize(item)]
+            return name
+
+        def array(self, item):
+            '''
+            Frames of a gait as one contiguous (N, 4, 3) float array, the same
+            frames as self[item], from its <name>_array method.
+            '''
+            return getattr(self, self.gait_name(item) + '_array')()
+
+        def stream(self, item):
+            '''
+            Frames of a gait one (4, 3) array at a time, built as they are
+            consumed for gaits with a <name>_chunks generator (dance), so the
+            first frame does not wait for the whole gait. The state changes
+            of building the gait (z_current ...) happen while it is consumed.
+            '''
+            name = self.gait_name(item)
+            chunks = getattr(self, name + '_chunks', None)
+            if chunks is None:
+                yield from self.array(name)
+                return
+            for chunk in chunks():
+                yield from chunk
+
+        def values(self):
+            # the numbers the gait templates index, in the current state
+            values = [
+                self.X_DEFAULT, self.Y_DEFAULT, self.z_current, self.X_TURN, self.Y_START, self.Z_UP,
+                self.Y_DEFAULT*2, self.X_START, self.Y_TURN, self.Z_TURN, self.Z_PUSH, self.Y_WAVE,
+                self.Z_WAVE, self.Z_DEFAULT, self.TURN_X1, self.TURN_Y1, self.TURN_X0, self.TURN_Y0,
+            ]
+            return np.array(values + self.turn_angle_coord(self.angle), dtype=float)
+
+        def signature(self):
+            # current values of the gait constants, compiled gaits depend on them
+            return tuple(getattr(self, name) for name in self.CONSTANTS)
         
         def turn_angle_coord(self, angle):
             a = math.atan(self.Y_DEFAULT/(self.X_DEFAULT+self.LENGTH_SIDE/2))
@@ -310,72 +1104,41 @@ class Picrawler(Robot):
         # 装饰器封装函数,判断是否站立
         def check_stand(func):
             def wrapper(self):
-                _action = []
-                if not self.is_stand():
-                    _action += self.stand
-                _action += func(self)
-                return _action
+                if self.is_stand():
+                    return func(self)
+                # stand first, it changes z_current
+                stand = self.stand_array()
+                return np.concatenate((stand, func(self)))
             return wrapper
         
         # 装饰器封装函数，装饰器简化步态的0，1两种状态转化，状态0为2，3脚y轴为0，状态1为1，4脚y轴为0 mode为2种转化方式，mode0为1，2交换3，4交换，mode1为1，3交换2，4交换
         def normal_action(mode):
             def wrapper1(func):
                 def wrapper2(self):
-                    _action = []
                     if self.stand_position == 0:
-                        _action += func(self)
-                    else:
-                        temp = func(self)
-                        new_step = []
-                        for step in temp:
-                            if mode == 0:
-                                new_step = [step[1], step[0], step[3], step[2]]
-                            elif mode == 1:
-                                new_step = [step[2], step[3], step[0], step[1]]
-                            _action += [new_step]
-                    return _action
+                        return func(self)
+                    return func(self)[:, self.LEG_SWAPS[mode]]
                 return wrapper2
             return wrapper1
         
-        @property
         @normal_action(0)
-        def sit(self):
+        def sit_array(self):
             self.z_current = self.Z_UP
-            return [[
-                [self.X_DEFAULT,self.Y_DEFAULT,self.z_current],
-                [self.X_TURN,self.Y_START,self.z_current],
-                [self.X_TURN,self.Y_START,self.z_current],
-                [self.X_DEFAULT,self.Y_DEFAULT,self.z_current],
-            ]]
-            
+            return self.values()[self.SIT]
 
-        @property
         @normal_action(0)
-        def stand(self):
+        def stand_array(self):
             _stand = []
             if self.ready_state ==  0:
-                _stand += self.ready
+                _stand.append(self.ready_array())
             self.z_current = self.Z_DEFAULT
-            _stand += [[
-                [self.X_DEFAULT,self.Y_DEFAULT,self.z_current],
-                [self.X_DEFAULT,self.Y_START,self.z_current],
-                [self.X_DEFAULT,self.Y_START,self.z_current],
-                [self.X_DEFAULT,self.Y_DEFAULT,self.z_current],
-            ]]
-            return _stand
-           
-        
-        @property
-        def ready(self):
-            _ready = [[
-                [self.X_DEFAULT,self.Y_DEFAULT,self.z_current],
-                [self.X_TURN,self.Y_START,self.z_current],
-                [self.X_TURN,self.Y_START,self.z_current],
-                [self.X_DEFAULT,self.Y_DEFAULT,self.z_current],
-            ]]
+            _stand.append(self.values()[self.STAND])
+            return np.concatenate(_stand)
+
+        def ready_array(self):
+            _ready = self.values()[self.SIT]
             self.ready_state = 1
             return _ready
-          
 
         def is_sit(self):
             return self.z_current == self.Z_UP
@@ -385,194 +1148,71 @@ class Picrawler(Robot):
             # print("is stand? %s"%tmp)
             return tmp
         
-        @property
         @check_stand
         @normal_action(0)
-        def forward(self):
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT*2,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT*2,self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT*2, self.z_current]],
-                
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT*2, self.Z_UP]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START, self.Z_UP]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-            ]
-        
-        @property
+        def forward_array(self):
+            return self.values()[self.FORWARD]
+
         @check_stand
         @normal_action(0)
-        def backward(self):
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START,self.z_current],[self.X_TURN, self.Y_START, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT*2, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT*2, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT*2, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT*2, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-                [[self.X_TURN, self.Y_START, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT,self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-            ]
-        
-       
-        @property
+        def backward_array(self):
+            return self.values()[self.BACKWARD]
+
         @check_stand
         @normal_action(1)
-        def turn_left(self):
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START,self.z_current],[self.X_TURN, self.Y_START, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X0, self.TURN_Y0, self.Z_UP],[self.TURN_X0, self.TURN_Y0, self.z_current]],
-                [[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X0, self.TURN_Y0, self.z_current],[self.TURN_X0, self.TURN_Y0, self.z_current]],
-                
-                [[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X0, self.TURN_Y0, self.z_current],[self.TURN_X0, self.TURN_Y0, self.Z_UP]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START, self.Z_UP]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-            ]
+        def turn_left_array(self):
+            return self.values()[self.TURN_LEFT]
 
-        @property
         @check_stand
         @normal_action(1)
-        def turn_right(self):
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.TURN_X0, self.TURN_Y0, self.z_current],[self.TURN_X0, self.TURN_Y0, self.Z_UP],[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X1, self.TURN_X1, self.z_current]],
-                [[self.TURN_X0, self.TURN_Y0, self.z_current],[self.TURN_X0, self.TURN_Y0, self.z_current],[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X1, self.TURN_X1, self.z_current]],
-                [[self.TURN_X0, self.TURN_Y0, self.Z_UP],[self.TURN_X0, self.TURN_Y0, self.z_current],[self.TURN_X1, self.TURN_Y1, self.z_current],[self.TURN_X1, self.TURN_X1, self.z_current]],
-                [[self.X_TURN, self.Y_START, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]],
-                
-            ]
-        
-        @property
-        def push_up(self):
+        def turn_right_array(self):
+            return self.values()[self.TURN_RIGHT]
+
+        def push_up_array(self):
             _push_up = []
             if not self.is_sit():
-                _push_up += self.sit
-            _push_up += [
-                [[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_START, self.Y_TURN, self.Z_TURN],[self.X_START, self.Y_TURN,self.Z_TURN]],
-                [[self.X_TURN, self.Y_START, self.Z_PUSH],[self.X_TURN, self.Y_START, self.Z_PUSH],[self.X_START, self.Y_TURN, self.Z_TURN],[self.X_START, self.Y_TURN,self.Z_TURN]],
-                [[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_START, self.Y_TURN, self.Z_TURN],[self.X_START, self.Y_TURN,self.Z_TURN]],
-                [[self.X_TURN, self.Y_START, self.Z_PUSH],[self.X_TURN, self.Y_START, self.Z_PUSH],[self.X_START, self.Y_TURN, self.Z_TURN],[self.X_START, self.Y_TURN,self.Z_TURN]],
-                [[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_START, self.Y_TURN, self.Z_TURN],[self.X_START, self.Y_TURN,self.Z_TURN]],
-                [[self.X_TURN, self.Y_START, self.Z_PUSH],[self.X_TURN, self.Y_START, self.Z_PUSH],[self.X_START, self.Y_TURN, self.Z_TURN],[self.X_START, self.Y_TURN,self.Z_TURN]],
-                [[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_TURN, self.Y_START, self.Z_TURN],[self.X_START, self.Y_TURN, self.Z_TURN],[self.X_START, self.Y_TURN,self.Z_TURN]],
-            ]
-            if self.stand_position == 0:
-                _push_up.append([[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START,self.z_current],[self.X_TURN, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]])
-            else:
-                _push_up.append([[self.X_TURN, self.Y_START,self.z_current], [self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START, self.z_current]])
-            return _push_up
-        
-        @property
+                _push_up.append(self.sit_array())
+            values = self.values()
+            _push_up.append(values[self.PUSH_UP])
+            # back to sitting, in the leg order of the stand_position
+            sit = values[self.SIT]
+            _push_up.append(sit if self.stand_position == 0 else sit[:, self.LEG_SWAPS[0]])
+            return np.concatenate(_push_up)
+
         @check_stand
         @normal_action(0)
-        def wave(self):
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_START, self.Y_WAVE,self.Z_WAVE],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_START, self.Y_WAVE,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_START, self.Y_WAVE,self.Z_WAVE],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_START, self.Y_WAVE,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_START, self.Y_WAVE,self.Z_WAVE],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_START, self.Y_WAVE,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START,self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-            ]
-        
-        @property
+        def wave_array(self):
+            return self.values()[self.WAVE]
+
         @check_stand
         @normal_action(1)
-        def look_left(self):
-            li = self.turn_angle_coord(self.angle)
-            temp_x1 = li[0:2]
-            temp_x1.append(self.z_current)
-            temp_x2 = li[2:4]
-            temp_x2.append(self.z_current)
-            temp_x3 = li[4:6]
-            temp_x3.append(self.z_current)
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START,self.z_current],[self.X_TURN, self.Y_START, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [temp_x1, temp_x2,[self.X_TURN, self.Y_START, self.Z_UP],temp_x3]
-            ]
-            
-        @property
+        def look_left_array(self):
+            return self.values()[self.LOOK_LEFT]
+
         @check_stand
         @normal_action(1)
-        def look_right(self):
-            li = self.turn_angle_coord(self.angle)
-            temp_x1 = li[0:2]
-            temp_x1.append(self.z_current)
-            temp_x2 = li[2:4]
-            temp_x2.append(self.z_current)
-            temp_x3 = li[4:6]
-            temp_x3.append(self.z_current)
-            return [
-                [
-                    [self.X_DEFAULT, self.Y_DEFAULT, self.z_current],
-                    [self.X_TURN, self.Y_START,self.Z_UP],
-                    [self.X_DEFAULT, self.Y_START, self.z_current],
-                    [self.X_DEFAULT, self.Y_DEFAULT, self.z_current]
-                ],
-                [temp_x3, [self.X_TURN, self.Y_START, self.Z_UP], temp_x2, temp_x1]
-            ]
-        
-        @property
+        def look_right_array(self):
+            return self.values()[self.LOOK_RIGHT]
+
         @check_stand
         @normal_action(1)
-        def turn_left_angle(self):
-            li = self.turn_angle_coord(self.angle)
-            temp_x1 = li[0]
-            temp_y1 = li[1]
-            temp_x2 = li[2]
-            temp_y2 = li[3]
-            temp_x3 = li[4]
-            temp_y3 = li[5]
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START,self.z_current],[self.X_TURN, self.Y_START, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[temp_x1, temp_y1, self.z_current], [temp_x2, temp_y2, self.z_current],[self.X_TURN, self.Y_START, self.Z_UP],[temp_x3, temp_y3, self.z_current]],
-                [[temp_x1, temp_y1, self.z_current], [temp_x2, temp_y2, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[temp_x3, temp_y3, self.z_current]],
-                [[temp_x1, temp_y1, self.z_current], [temp_x2, temp_y2, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[temp_x3, temp_y3, self.Z_UP]],
-                [[temp_x1, temp_y1, self.z_current], [temp_x2, temp_y2, self.z_current],[self.X_TURN, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START, self.Z_UP]],
-                [[temp_x1, temp_y1, self.z_current], [temp_x2, temp_y2, self.z_current],[self.X_TURN, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_START, self.z_current]]
-            ]
-            
-        @property
+        def turn_left_angle_array(self):
+            return self.values()[self.TURN_LEFT_ANGLE]
+
         @check_stand
         @normal_action(1)
-        def turn_right_angle(self):
-            li = self.turn_angle_coord(self.angle)
-            temp_x1 = li[0]
-            temp_y1 = li[1]
-            temp_x2 = li[2]
-            temp_y2 = li[3]
-            temp_x3 = li[4]
-            temp_y3 = li[5]
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_TURN, self.Y_START,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-                [[temp_x3,temp_y3, self.z_current], [self.X_TURN, self.Y_START, self.Z_UP], [temp_x2, temp_y2, self.z_current], [temp_x1, temp_y1, self.z_current]],
-                [[temp_x3,temp_y3, self.z_current], [self.X_DEFAULT, self.Y_DEFAULT, self.z_current], [temp_x2, temp_y2, self.z_current], [temp_x1, temp_y1, self.z_current]],
-                [[temp_x3,temp_y3, self.Z_UP], [self.X_DEFAULT, self.Y_DEFAULT, self.z_current], [temp_x2, temp_y2, self.z_current], [temp_x1, temp_y1, self.z_current]],
-                [[self.X_TURN, self.Y_START, self.Z_UP], [self.X_DEFAULT, self.Y_DEFAULT, self.z_current], [temp_x2, temp_y2, self.z_current], [temp_x1, temp_y1, self.z_current]],
-                [[self.X_DEFAULT, self.Y_START, self.z_current], [self.X_DEFAULT, self.Y_DEFAULT, self.z_current], [temp_x2, temp_y2, self.z_current], [temp_x1, temp_y1, self.z_current]],
-            ]
-            
-        
-        @property
+        def turn_right_angle_array(self):
+            return self.values()[self.TURN_RIGHT_ANGLE]
+
         @check_stand
         @normal_action(0)
-        def look_up(self):
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.Z_DEFAULT],[self.X_DEFAULT, self.Y_START,self.Z_DEFAULT],[self.X_TURN, self.Y_START, self.Z_UP],[self.X_DEFAULT, self.Y_DEFAULT, self.Z_UP]],
-            ]
-            
-        @property
+        def look_up_array(self):
+            return self.values()[self.LOOK_UP]
+
         @check_stand
         @normal_action(0)
-        def look_down(self):
-            return [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.Z_UP],[self.X_TURN, self.Y_START,self.Z_UP],[self.X_DEFAULT, self.Y_START, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-            ]
+        def look_down_array(self):
+            return self.values()[self.LOOK_DOWN]
         
         def rotate_body_absolute_x(self, degree_x):
             degree_x = degree_x * math.pi / 180
@@ -594,35 +1234,74 @@ class Picrawler(Robot):
             return [[self.X_DEFAULT - x,self.Y_DEFAULT - y,self.Z_TURN - z],[self.X_DEFAULT + x,self.Y_DEFAULT - y,self.Z_TURN - z],[self.X_DEFAULT + x,self.Y_DEFAULT + y,self.Z_TURN - z],[self.X_DEFAULT - x,self.Y_DEFAULT + y,self.Z_TURN - z]]
         
         
+        def move_body_array(self, x, y, z):
+            # move_body_absolute for arrays of x, y, z, (N, 4, 3)
+            x, y, z = np.broadcast_arrays(x, y, z)
+            frames = np.empty((len(x), 4, 3))
+            frames[:, :, 0] = self.X_DEFAULT + np.multiply.outer(x, (-1, 1, 1, -1))
+            frames[:, :, 1] = self.Y_DEFAULT + np.multiply.outer(y, (-1, -1, 1, 1))
+            frames[:, :, 2] = (self.Z_TURN - z)[:, np.newaxis]
+            return frames
+
         def to_rad(self, deg):
             return deg * math.pi / 180
-        
-        @property
-        def dance(self):
-            _dance = []
+
+        def dance_chunks(self):
+            # dance, built with array operations, one part of at most 120 frames at a time
             if not self.is_sit():
-                _dance += self.sit
-            _dance += [
-                [[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current],[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]],
-            ]
-            for i in range(0, 360, 5):
-                _dance.append(self.move_body_absolute(40 * math.sin(self.to_rad(i)), 40 * math.cos(self.to_rad(i)), 0))
-            for i in range(360, 0, -5):
-                _dance.append(self.move_body_absolute(40 * math.sin(self.to_rad(i)), 40 * math.cos(self.to_rad(i)), 0))
-            _dance.append(self.rotate_body_absolute_x(-20))
-            _dance.append(self.rotate_body_absolute_x(20))
-            _dance.append(self.move_body_absolute(0, 0, 0))
-            _dance.append(self.rotate_body_absolute_y(-20))
-            _dance.append(self.rotate_body_absolute_y(20))
+                yield self.sit_array()
+            yield np.array([[[self.X_DEFAULT, self.Y_DEFAULT, self.z_current]] * 4], dtype=float)
+            for deg in (np.arange(0, 360, 5), np.arange(360, 0, -5)):
+                rad = self.to_rad(deg)
+                yield self.move_body_array(40 * np.sin(rad), 40 * np.cos(rad), 0.0)
+            yield np.array([
+                self.rotate_body_absolute_x(-20),
+                self.rotate_body_absolute_x(20),
+                self.move_body_absolute(0, 0, 0),
+                self.rotate_body_absolute_y(-20),
+                self.rotate_body_absolute_y(20),
+            ], dtype=float)
+            deg = np.arange(0, 360, 3)
+            rad = self.to_rad(deg)
             for j in range(0, 3):
-                for i in range(0, 360, 3):
-                    _dance.append(self.move_body_absolute(40 * math.sin(self.to_rad(i)), 40 * math.cos(self.to_rad(i)), (i / 360.0 + j) * 15))
+                yield self.move_body_array(40 * np.sin(rad), 40 * np.cos(rad), (deg / 360.0 + j) * 15)
             for j in range(3, 0, -1):
-                for i in range(0, 360, 3):
-                    _dance.append(self.move_body_absolute(40 * math.sin(self.to_rad(i)), 40 * math.cos(self.to_rad(i)), ((360 - i) / 360.0 + j - 1) * 15))
-            _dance.append(self.move_body_absolute(0, 0, 0))
-            return _dance
+                yield self.move_body_array(40 * np.sin(rad), 40 * np.cos(rad), ((360 - deg) / 360.0 + j - 1) * 15)
+            yield np.array([self.move_body_absolute(0, 0, 0)], dtype=float)
+
+        def dance_array(self):
+            return np.concatenate(list(self.dance_chunks()))
+
+        # gait names, looked up by MoveList[name] and registered as actions
+        GAITS = {}
+        for _name in ('sit', 'stand', 'ready', 'forward', 'backward', 'turn_left', 'turn_right', 'push_up', 'wave',
+                      'look_left', 'look_right', 'turn_left_angle', 'turn_right_angle', 'look_up', 'look_down', 'dance'):
+            GAITS[_name] = _name
+            GAITS[_name.replace('_', ' ')] = _name
+        del _name
+
+        def as_list(name):
+            # property <name>: the frames of <name>_array as nested lists, the gaits' public form
+            return property(lambda self: getattr(self, name + '_array')().tolist())
 
+        sit = as_list('sit')
+        stand = as_list('stand')
+        ready = as_list('ready')
+        forward = as_list('forward')
+        backward = as_list('backward')
+        turn_left = as_list('turn_left')
+        turn_right = as_list('turn_right')
+        push_up = as_list('push_up')
+        wave = as_list('wave')
+        look_left = as_list('look_left')
+        look_right = as_list('look_right')
+        turn_left_angle = as_list('turn_left_angle')
+        turn_right_angle = as_list('turn_right_angle')
+        look_up = as_list('look_up')
+        look_down = as_list('look_down')
+        dance = as_list('dance')
+        # gaits that swap the standing legs every cycle
+        LOCOMOTION = ('forward', 'backward', 'turn_left', 'turn_right', 'turn_left_angle', 'turn_right_angle')
 
 
     def do_single_leg(self,leg,coodinate=[50,50,-33],speed=50):
@@ -632,16 +1311,16 @@ class Picrawler(Robot):
  
 
     def current_step_leg_value(self,leg):
-        return list.copy(self.current_coord[leg])
+        return self.state.leg(leg)
         
     def current_step_all_leg_value(self):
-        return list.copy(self.current_coord)
+        return self.state.legs()
 
     def mix_step(self,basic_step,leg,coodinate=[50,50,-33]):
-        # Pay attention to adding list(), otherwise the address pointer is returned
-        new_step = list(basic_step)
-        new_step[leg] = coodinate
-        return list(new_step)
+        # new lists all the way down, the step shares nothing with basic_step or coodinate
+        new_step = [list(coord) for coord in basic_step]
+        new_step[leg] = list(coodinate)
+        return new_step
 
   
     
@@ -0,0 +1,78 @@
+'''
+Action packs from other installed packages, found through entry points of
+the 'picrawler.actions' group, one entry point per action:
+
+    # setup.py of the pack
+    entry_points={
+        'picrawler.actions': [
+            'wiggle = my_pack.actions:wiggle',
+        ],
+    }
+
+The entry point name is the action name, its object is either a list of
+steps (like add_action) or a function taking the Picrawler (like the
+actions_dict entries of preset_actions.py).
+
+Discovery only reads the installed package metadata, nothing of the pack is
+imported until one of its actions is run. Step lists are solved into a
+compiled table then, which later runs replay without IK.
+'''
+from importlib import metadata
+
+import numpy as np
+
+from .actions import ActionRegistry
+
+GROUP = 'picrawler.actions'
+
+
+def entry_points(group=GROUP):
+    eps = metadata.entry_points()
+    if hasattr(eps, 'select'):
+        return list(eps.select(group=group))
+    # python < 3.10, a dict of groups
+    return list(eps.get(group, ()))
+
+
+class PluginAction(object):
+    '''
+    One action of an action pack: the entry point metadata, read when
+    discovered, and the action, imported and compiled on first use.
+    '''
+    def __init__(self, entry_point):
+        self.entry_point = entry_point
+        self.name = entry_point.name
+        self.value = entry_point.value
+        dist = getattr(entry_point, 'dist', None)
+        self.package = dist.metadata['Name'] if dist is not None else None
+        self.version = dist.version if dist is not None else None
+        self.loaded = False
+
+    def load(self, spider):
+        '''
+        Import the action and prepare it for spider.
+
+        return: (kind, action) for ActionRegistry, a FUNCTION or a COMPILED
+                (angles, coords, limit_flags, None) table of the steps
+        '''
+        action = self.entry_point.load()
+        self.loaded = True
+        if callable(action):
+            return ActionRegistry.FUNCTION, action
+        steps = np.array(action, dtype=float)
+        if steps.ndim != 3 or steps.shape[1:] != (4, 3):
+            raise TypeError('%s (%s) is neither a function nor a list of steps'%(self.name, self.value))
+        angles, coords, flags = spider.solve_steps(steps)
+        return ActionRegistry.COMPILED, (angles, coords, flags, None)
+
+    def __repr__(self):
+        return 'PluginAction(%s = %s, %s %s)'%(self.name, self.value, self.package, self.version)
+
+
+def discover(group=GROUP):
+    # {name: PluginAction} of the installed packs, the first one of a name wins
+    plugins = {}
+    for entry_point in entry_points(group):
+        if entry_point.name not in plugins:
+            plugins[entry_point.name] = PluginAction(entry_point)
+    return plugins
@@ -0,0 +1,384 @@
+'''
+The preset actions of the example frontends (examples, gpt_examples,
+gemini_examples), declared as data in one place.
+
+STEP_ACTIONS are lists of parts, each part run in turn:
+    ('steps', speed, steps, pause)     do_step every step at speed, then wait
+                                       pause seconds
+    ('body', speed, positions, pause)  the same, the steps are the
+                                       MoveList.move_body_absolute(x, y, z) of
+                                       the positions
+They are solved once into compiled.FRAME tables, saved in a cache directory
+(~/.cache/picrawler, see cache_directory) as <name>-<hash>.pca and memory
+mapped on later runs. The hash covers the declaration, the leg
+lengths and the MoveList constants, a change to any of them compiles the
+action again. Playing one is play_compiled, no IK at runtime.
+
+GAIT_ACTIONS are MoveList gaits, (gait, step, speed), they are run with
+do_action and its gait_cache.
+'''
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from .compiled import FRAME, EXTENSION, VERSION, compile_action, save_action, load_action
+
+STAND = [[45, 45, -50], [45, 0, -50], [45, 0, -50], [45, 45, -50]]
+RETURN_STAND = [
+    [[45, 45, -50], [45, 0, -30], [45, 0, -50], [45, 45, -50]],
+    [[45, 45, -50], [45, 0, -40], [45, 0, -50], [45, 45, -50]],
+    STAND,
+]
+# body circle of warm_up, (x, y, z) for move_body_absolute
+CIRCLE = [
+    (0, 25, 10), (12.5, 21.65, 10), (21.65, 12.5, 10), (25, 0, 10), (21.65, -12.5, 10), (12.5, -21.65, 10),
+    (0, -25, 10), (-12.5, -21.65, 10), (-21.65, -12.5, 10), (-25, 0, 10), (-21.65, 12.5, 10), (-12.5, 21.65, 10),
+    (0, 25, 10),
+]
+
+GAIT_ACTIONS = {
+    'sit': ('sit', 1, 60),
+    'stand': ('stand', 1, 60),
+    'dance': ('dance', 1, 95),
+    'move_forward': ('forward', 2, 80),
+    'move_backward': ('backward', 2, 80),
+    'turn_left': ('turn left', 2, 80),
+    'turn_right': ('turn right', 2, 80),
+}
+
+STEP_ACTIONS = {
+    'look_up': [
+        ('steps', 60, [
+            STAND,
+            [[45, 45, -76], [45, 0, -76], [45, 0, -38], [45, 45, -30]],
+        ], 0),
+    ],
+    'look_down': [
+        ('steps', 60, [
+            STAND,
+            [[45, 45, -28], [45, 0, -40], [45, 0, -68], [45, 45, -76]],
+        ], 0),
+    ],
+    'wave_hand': [
+        ('steps', 80, [STAND], 0),
+        ('steps', 90, [
+            [[45, 45, -70], [50, 40, 120], [45, 0, -60], [45, 45, -30]],
+            [[45, 45, -70], [-20, 60, 120], [45, 0, -60], [45, 45, -30]],
+        ] * 3, 0),
+        ('steps', 80, RETURN_STAND, 0),
+    ],
+    'beckon': [
+        ('steps', 80, [STAND], 0),
+        ('steps', 90, [
+            [[45, 45, -70], [10, 60, 120], [45, 0, -60], [45, 45, -30]],
+            [[45, 45, -70], [10, 60, 50], [45, 0, -60], [45, 45, -30]],
+        ] * 3, 0),
+        ('steps', 80, RETURN_STAND, 0),
+    ],
+    'shake_hand': [
+        ('steps', 80, [
+            STAND,
+            [[45, 45, -65], [5, 280, 80], [45, 0, -60], [45, 45, -40]],
+        ], 0.2),
+        ('steps', 82, [
+            [[45, 45, -65], [5, 280, 100], [45, 0, -60], [45, 45, -40]],
+            [[45, 45, -65], [5, 280, -10], [45, 0, -60], [45, 45, -40]],
+        ] * 3 + [
+            [[45, 45, -65], [5, 100, 10], [45, 0, -60], [45, 45, -40]],
+            [[45, 45, -65], [5, 100, 10], [45, 0, -60], [45, 45, -40]],
+        ], 0),
+        ('steps', 80, RETURN_STAND, 0),
+    ],
+    'fighting': [
+        # ready
+        ('steps', 80, [
+            STAND,
+            [[45, 45, -40], [45, 0, -40], [50, 20, -20], [45, 45, -50]],
+            [[45, 45, -40], [45, 0, -40], [40, 20, -45], [45, 45, -50]],
+            [[45, 45, -40], [45, 0, -40], [60, 40, -60], [45, 45, -40]],
+            [[45, 45, -40], [45, 30, -30], [60, 40, -60], [45, 45, -40]],
+            [[45, 45, -30], [45, 30, -30], [60, 40, -60], [60, 40, -60]],
+        ], 0),
+        # twist butt, shrink
+        ('steps', 82, [
+            [[55, 7, -30], [19, 48, -30], [77, 12, -60], [36, 63, -60]],
+            [[19, 48, -30], [55, 7, -30], [36, 63, -60], [77, 12, -60]],
+        ] * 2 + [
+            [[40, 30, -30], [40, 30, -30], [60, 40, -60], [60, 40, -60]],
+            [[40, 60, -30], [40, 60, -30], [60, 10, -60], [60, 10, -60]],
+        ], 0.2),
+        # pounce, bite
+        ('steps', 100, [
+            [[40, 40, -60], [20, 60, 110], [60, 60, -60], [60, 60, -60]],
+            [[40, 40, -40], [20, 30, -40], [60, 60, -60], [60, 60, -60]],
+            [[20, 60, 110], [20, 30, -60], [60, 60, -60], [60, 60, -60]],
+            [[20, 30, -40], [20, 30, -40], [60, 60, -60], [60, 60, -60]],
+        ], 1),
+        ('steps', 82, RETURN_STAND, 0),
+    ],
+    'excited': [
+        ('steps', 80, [STAND], 0),
+        ('steps', 95, [
+            [[45, 45, -30], [45, 0, -30], [45, 0, -30], [45, 45, -30]],
+            [[45, 45, -65], [45, 0, -65], [45, 0, -65], [45, 45, -65]],
+            [[45, 45, -70], [45, 0, -70], [45, 0, -70], [45, 45, -70]],
+            [[45, 45, -30], [45, 0, -30], [45, 0, -30], [45, 45, -30]],
+            [[45, 45, -65], [45, 0, -65], [45, 0, -65], [45, 45, -65]],
+            [[45, 45, -75], [45, 0, -75], [45, 0, -75], [45, 45, -75]],
+            [[45, 45, -30], [45, 0, -30], [45, 0, -30], [45, 45, -30]],
+            [[45, 45, -65], [45, 0, -65], [45, 0, -65], [45, 45, -65]],
+            [[45, 45, -80], [45, 0, -80], [45, 0, -80], [45, 45, -80]],
+        ], 0),
+        ('steps', 80, [
+            [[45, 45, -30], [45, 0, -30], [45, 0, -30], [45, 45, -30]],
+            [[45, 45, -65], [45, 0, -65], [45, 0, -65], [45, 45, -65]],
+            STAND,
+        ], 0),
+    ],
+    'play_dead': [
+        ('steps', 60, [
+            STAND,
+            [[45, 45, -10], [45, 0, -10], [45, 0, -10], [45, 45, -10]],
+        ], 0),
+        ('steps', 85, [[[45, 45, 100], [45, 45, 100], [45, 45, 100], [45, 45, 100]]] + [
+            [[45, 35, 60], [35, 45, 80], [35, 45, 80], [45, 35, 60]],
+            [[35, 45, 80], [45, 35, 60], [45, 35, 60], [35, 45, 80]],
+        ] * 5 + [[[45, 45, 100], [45, 45, 100], [45, 45, 100], [45, 45, 100]]], 0),
+        ('steps', 60, [STAND], 0),
+    ],
+    'nod': [
+        ('steps', 60, [STAND], 0),
+        ('steps', 70, [
+            [[45, 45, -80], [45, 0, -50], [45, 0, -20], [45, 45, -30]],
+            [[45, 45, -20], [45, 0, -36], [45, 20, -52], [40, 20, -80]],
+            [[45, 45, -80], [45, 0, -50], [45, 0, -20], [45, 45, -30]],
+            [[45, 45, -20], [45, 0, -36], [45, 20, -52], [40, 20, -80]],
+            [[45, 45, -80], [45, 0, -50], [45, 0, -20], [45, 45, -30]],
+        ], 0.2),
+        ('steps', 80, [
+            [[45, 45, -80], [45, 0, -50], [45, 0, -40], [45, 45, -40]],
+            [[45, 45, -60], [45, 0, -50], [45, 0, -40], [45, 45, -40]],
+            STAND,
+        ], 1),
+    ],
+    'shake_head': [
+        ('steps', 80, [
+            [[45, 45, -50], [45, 20, -50], [45, 0, -50], [45, 45, -50]],
+            [[45, 45, -50], [45, 20, -50], [45, 20, -30], [45, 45, -50]],
+            [[45, 45, -50], [45, 20, -50], [45, 45, -50], [45, 45, -50]],
+        ], 0),
+        ('steps', 90, [
+            [[55, 7, -50], [19, 48, -50], [77, 12, -50], [36, 63, -50]],
+            [[19, 48, -50], [55, 7, -50], [36, 63, -50], [77, 12, -50]],
+            [[51, 15, -50], [27, 43, -50], [72, 22, -50], [45, 56, -50]],
+            [[27, 43, -50], [51, 15, -50], [45, 56, -50], [72, 22, -50]],
+            [[45, 45, -50], [45, 45, -50], [45, 45, -50], [45, 45, -50]],
+        ], 0.5),
+        ('steps', 82, [
+            [[45, 45, -50], [45, 0, -50], [45, 20, -30], [45, 45, -50]],
+            STAND,
+        ], 0),
+    ],
+    'look_left': [
+        ('steps', 80, [
+            STAND,
+            [[45, 0, -50], [45, 45, -50], [45, 45, -50], [45, 0, -50]],
+            [[0, 45, -50], [45, 45, -50], [45, 45, -50], [45, 0, -50]],
+            [[0, 45, -50], [45, 45, -35], [45, 45, -50], [45, 0, -50]],
+            STAND,
+        ], 0),
+    ],
+    'look_right': [
+        ('steps', 80, [
+            STAND,
+            STAND,
+            [[45, 45, -50], [0, 45, -50], [45, 0, -50], [45, 45, -50]],
+            [[45, 45, -35], [0, 45, -50], [45, 0, -50], [45, 45, -50]],
+            [[45, 0, -50], [45, 45, -50], [45, 45, -50], [45, 0, -50]],
+        ], 0),
+    ],
+    'warm_up': [
+        ('steps', 80, [
+            STAND,
+            [[45, 45, -50], [45, 45, -50], [45, 45, -50], [45, 45, -50]],
+        ], 0.5),
+        # left, right
+        ('steps', 75, [
+            [[45, 37, -85], [45, 37, -14], [45, 37, -14], [45, 37, -85]],
+            [[45, 45, -50], [45, 45, -50], [45, 45, -50], [45, 45, -50]],
+        ] * 2 + [
+            [[45, 37, -14], [45, 37, -85], [45, 37, -85], [45, 37, -14]],
+            [[45, 45, -50], [45, 45, -50], [45, 45, -50], [45, 45, -50]],
+        ] * 2, 0.3),
+        # clockwise, anticlockwise
+        ('body', 90, CIRCLE, 0.3),
+        ('body', 90, [(-x, y, z) for x, y, z in CIRCLE], 0.3),
+        ('steps', 80, [
+            [[45, 45, -50], [45, 45, -40], [45, 0, -50], [45, 45, -50]],
+            STAND,
+        ], 0),
+    ],
+    'push_up': [
+        ('steps', 70, [
+            STAND,
+            [[60, 10, -60], [60, 0, -60], [20, 60, 10], [10, 65, -40]],
+            [[70, 0, -76], [70, 0, -76], [0, 130, -40], [0, 130, -40]],
+        ], 0),
+        ('steps', 80, [
+            [[70, 0, -40], [70, 0, -40], [0, 130, -40], [0, 130, -40]],
+            [[70, 0, -76], [70, 0, -76], [0, 130, -40], [0, 130, -40]],
+        ] * 3, 0),
+    ],
+}
+
+NAMES = tuple(GAIT_ACTIONS) + tuple(STEP_ACTIONS)
+
+
+def cache_directory():
+    # PICRAWLER_ACTIONS_DIR, else picrawler in the user cache directory ($XDG_CACHE_HOME or ~/.cache)
+    directory = os.environ.get('PICRAWLER_ACTIONS_DIR')
+    if directory:
+        return directory
+    cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'picrawler')
+
+
+class PresetLibrary(object):
+    '''
+    The compiled STEP_ACTIONS of one Picrawler.
+
+    directory: where the .pca files are kept, default cache_directory().
+               False, or a directory that cannot be written, keeps the
+               compiled actions in memory only, for this run.
+    log:       function called with the path of every file written
+    '''
+    def __init__(self, spider, directory=None, log=print):
+        self.spider = spider
+        if directory is None:
+            directory = cache_directory()
+        self.directory = directory or None
+        self.log = log
+        self.tables = {}  # name -> (digest, frames)
+
+    def digest(self, name):
+        # hash of everything the compiled frames depend on
+        spider = self.spider
+        ik = None if spider.ik_table is None else spider.ik_table.resolution
+        content = json.dumps([VERSION, name, STEP_ACTIONS[name], [spider.A, spider.B, spider.C],
+            spider.move_list.signature(), ik])
+        return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+    def path(self, name, digest):
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, '%s-%s%s'%(name, digest, EXTENSION))
+
+    def frames(self, name):
+        '''
+        return: the compiled frames of a STEP_ACTIONS action, memory mapped
+                when they come from disk
+        '''
+        digest = self.digest(name)
+        entry = self.tables.get(name)
+        if entry is not None and entry[0] == digest:
+            return entry[1]
+        path = self.path(name, digest)
+        if path is not None and os.path.exists(path):
+            frames = load_action(path)
+        else:
+            frames = self.compile(name)
+            self.save(name, digest, frames)
+        self.tables[name] = (digest, frames)
+        return frames
+
+    def parts(self, name):
+        # (speed, steps (N, 4, 3), pause) of each part of a STEP_ACTIONS action
+        for kind, speed, steps, pause in STEP_ACTIONS[name]:
+            if kind == 'body':
+                x, y, z = np.array(steps, dtype=float).T
+                steps = self.spider.move_list.move_body_array(x, y, z)
+            yield speed, np.array(steps, dtype=float).reshape(-1, 4, 3), pause
+
+    def steps(self, name):
+        # every step of a STEP_ACTIONS action, (N, 4, 3), as asked for before IK
+        return np.concatenate([steps for _, steps, _ in self.parts(name)])
+
+    def compile(self, name):
+        tables = []
+        for speed, steps, pause in self.parts(name):
+            angles, coords, _ = self.spider.solve_steps(steps)
+            table = np.zeros(len(angles), dtype=FRAME)
+            table['angles'] = angles
+            table['coords'] = coords
+            table['speed'] = speed
+            table['delay'][-1] = pause
+            tables.append(table)
+        return np.concatenate(tables)
+
+    def save(self, name, digest, frames):
+        # replaces the files of older versions of the action
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for file in os.listdir(self.directory):
+                if file.startswith(name + '-') and file.endswith(EXTENSION):
+                    os.remove(os.path.join(self.directory, file))
+            path = self.path(name, digest)
+            save_action(path, frames)
+            if self.log is not None:
+                self.log('compiled %s -> %s'%(name, path))
+        except OSError:
+            pass
+
+    def run(self, name, speed=None):
+        # speed None: the speeds of the declaration
+        if name in GAIT_ACTIONS:
+            gait, step, gait_speed = GAIT_ACTIONS[name]
+            self.spider.do_action(gait, step=step, speed=gait_speed if speed is None else speed)
+        elif name in STEP_ACTIONS:
+            self.spider.play_compiled(self.frames(name), speed)
+        else:
+            raise KeyError('No such preset action: %s'%name)
+
+
+def library(spider):
+    # the PresetLibrary of spider, made on first use
+    if spider.presets is None:
+        spider.presets = PresetLibrary(spider)
+    return spider.presets
+
+
+def preset(name):
+    # func(spider) running the preset action name, like the functions of actions_dict
+    if name not in GAIT_ACTIONS and name not in STEP_ACTIONS:
+        raise KeyError('No such preset action: %s'%name)
+    def action(spider):
+        library(spider).run(name)
+    action.__name__ = name
+    return action
+
+
+def actions_dict(names=NAMES):
+    '''
+    {name: func(spider)} of the preset actions names, for the frontends and
+    Picrawler.add_actions
+    '''
+    return {name: preset(name) for name in names}
+
+
+def check_delays(spider, name):
+    '''
+    Compile the STEP_ACTIONS action name the way the compile command does,
+    through compiled.compile_action, and check that the pauses of the
+    declaration end up on the same frames.
+
+    return: the compiled frames, ValueError when the delays differ
+    '''
+    frames = compile_action(spider, preset(name))
+    expected = library(spider).compile(name)['delay']
+    if len(frames) != len(expected) or not np.allclose(frames['delay'], expected, atol=1e-6):
+        raise ValueError('%s compiled with delays %s instead of %s'%(name, frames['delay'].tolist(), expected.tolist()))
+    return frames
@@ -0,0 +1,73 @@
+from array import array
+import time
+
+
+class StageProfiler(object):
+    '''
+    Time spent in each stage of a frame, accumulated in preallocated arrays.
+
+    Stages:
+        ik          - coord2polar of the 4 legs in do_step
+        limit       - limit_angle in set_angle
+        fallback    - polar2coord when an angle was limited
+        servo_move  - sending the frame to the servos
+        compile     - compile_action, gait cache lookup or batch IK
+
+    log_interval: seconds between summaries printed by frame(), None for no log
+    log:          function taking the summary text
+    '''
+    STAGES = ('ik', 'limit', 'fallback', 'servo_move', 'compile')
+    IK, LIMIT, FALLBACK, SERVO_MOVE, COMPILE = range(len(STAGES))
+
+    def __init__(self, log_interval=None, log=print):
+        self.log_interval = log_interval
+        self.log = log
+        n = len(self.STAGES)
+        self.count = array('q', [0] * n)
+        self.total = array('q', [0] * n)
+        self.max = array('q', [0] * n)
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.STAGES)):
+            self.count[i] = 0
+            self.total[i] = 0
+            self.max[i] = 0
+        self.frames = 0
+        self.last_log = time.perf_counter()
+
+    def add(self, stage, ns):
+        self.count[stage] += 1
+        self.total[stage] += ns
+        if ns > self.max[stage]:
+            self.max[stage] = ns
+
+    def frame(self):
+        # end of a frame, prints the summary every log_interval seconds
+        self.frames += 1
+        if self.log_interval is not None:
+            now = time.perf_counter()
+            if now - self.last_log >= self.log_interval:
+                self.last_log = now
+                self.log(self.summary())
+
+    def snapshot(self):
+        '''
+        return: {stage: {'count', 'total_ms', 'mean_us', 'max_us'}} and 'frames'
+        '''
+        stages = {}
+        for i, name in enumerate(self.STAGES):
+            count = self.count[i]
+            stages[name] = {
+                'count': count,
+                'total_ms': self.total[i] / 1e6,
+                'mean_us': self.total[i] / count / 1e3 if count else 0.0,
+                'max_us': self.max[i] / 1e3,
+            }
+        return {'frames': self.frames, 'stages': stages}
+
+    def summary(self):
+        snapshot = self.snapshot()
+        parts = ['%s %d x %.1f us (max %.1f)'%(name, s['count'], s['mean_us'], s['max_us'])
+            for name, s in snapshot['stages'].items() if s['count']]
+        return 'picrawler %d frames: %s'%(snapshot['frames'], ', '.join(parts))
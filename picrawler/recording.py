@@ -0,0 +1,151 @@
+'''
+Motion recordings: every frame sent to the servos, with its time, appended
+to a binary log while recording, memory mapped for playback.
+
+File layout (little endian):
+    header  '<4sHH'  magic b'PCRL', version, reserved
+    records RECORD * n, as many as the file holds
+
+There is no frame count in the header, a recording can be appended to
+(Recorder on an existing file) and a file cut short by a crash still loads
+up to its last whole record. Appended frames continue the time column after
+its last frame is done moving, so times never go backwards whatever clock
+recorded them and the last move before the join plays in full.
+'''
+import numpy as np
+import struct
+import os
+
+from .backend import STEP_TIME, move_steps
+
+MAGIC = b'PCRL'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+RECORD = np.dtype([
+    ('time', '<f8'),            # seconds, on the clock of the Recorder
+    ('angles', '<f4', (12,)),   # as passed to servo_move
+    ('coords', '<f4', (4, 3)),  # current_coord after the frame
+    ('speed', '<f4'),           # servo_move speed, 0 for control loop setpoints
+])
+EXTENSION = '.pcr'
+
+
+class Recorder(object):
+    '''
+    Append frames to a recording file.
+
+    clock: function returning the time in seconds, e.g. time.perf_counter
+    flush: records kept in the file buffer before they are written out
+    '''
+    def __init__(self, path, clock, flush=50):
+        self.path = path
+        self.clock = clock
+        self.flush = flush
+        self.record_buffer = np.zeros(1, dtype=RECORD)
+        self.count = 0
+        # added to the clock, appended frames go on from the last stored time
+        self.offset = 0.0
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            records = load_recording(path)
+            # a copy of the last two frames, the memmap is closed before appending
+            tail = np.array(records[-2:])
+            del records
+            if len(tail):
+                # start after the last stored servo_move is done, not when it was sent
+                last = tail[-1]
+                done = float(last['time']) + move_time(last['angles'] - tail[0]['angles'], float(last['speed']))
+                self.offset = done + STEP_TIME / 1000 - clock()
+        self.file = open(path, 'ab')
+        if new:
+            self.file.write(HEADER.pack(MAGIC, VERSION, 0))
+
+    def record(self, coords, angles, speed):
+        record = self.record_buffer
+        record['time'] = self.clock() + self.offset
+        record['angles'] = angles
+        record['coords'] = coords
+        record['speed'] = speed
+        self.file.write(record.tobytes())
+        self.count += 1
+        if self.count % self.flush == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def check_header(path):
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or HEADER.unpack(header)[:2] != (MAGIC, VERSION):
+        raise ValueError('%s is not a motion recording (version %s)'%(path, VERSION))
+
+
+def load_recording(path):
+    '''
+    Memory map a recording, return a read-only array of RECORD. ValueError
+    when its times go backwards, playback could not find its frames.
+    '''
+    check_header(path)
+    count = (os.path.getsize(path) - HEADER.size) // RECORD.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD)
+    records = np.memmap(path, dtype=RECORD, mode='r', offset=HEADER.size, shape=(count,))
+    if (np.diff(records['time']) < 0).any():
+        raise ValueError('%s: the recorded times go backwards'%path)
+    return records
+
+
+def move_time(delta, speed):
+    # seconds servo_move takes for the angle changes delta (12,), 0 for setpoints
+    if speed <= 0:
+        return 0.0
+    return move_steps(delta, speed) * STEP_TIME / 1000
+
+
+def keyframes(records):
+    '''
+    Where the servos are over time: frame k leaves the previous frame at its
+    time and reaches its angles when servo_move would be done, or when the
+    next frame is sent if that is earlier.
+
+    return: (times (2N,), angles (2N, 12), coords (2N, 4, 3)), for np.interp
+    '''
+    n = len(records)
+    times = records['time'].astype(float)
+    angles = records['angles'].astype(float)
+    coords = records['coords'].astype(float)
+    previous = np.concatenate((angles[:1], angles[:-1]))
+    reached = times + np.array([move_time(d, s) for d, s in zip(angles - previous, records['speed'].tolist())])
+    reached[:-1] = np.minimum(reached[:-1], times[1:])
+
+    key_times = np.empty(2 * n)
+    key_times[0::2] = times
+    key_times[1::2] = reached
+    key_angles = np.empty((2 * n, 12))
+    key_angles[0::2] = previous
+    key_angles[1::2] = angles
+    key_coords = np.empty((2 * n, 4, 3))
+    key_coords[0::2] = np.concatenate((coords[:1], coords[:-1]))
+    key_coords[1::2] = coords
+    return key_times, key_angles, key_coords
+
+
+def sample(times, values, t, interpolate=True):
+    '''
+    values (K, ...) at time t of times (K,), linearly interpolated, or the
+    last value reached at t when interpolate is False
+    '''
+    i = int(np.searchsorted(times, t, side='right'))
+    if i <= 0:
+        return values[0]
+    if i >= len(times):
+        return values[-1]
+    if not interpolate:
+        return values[i - 1]
+    span = times[i] - times[i - 1]
+    if span <= 0:
+        return values[i]
+    s = (t - times[i - 1]) / span
+    return values[i - 1] + (values[i] - values[i - 1]) * s
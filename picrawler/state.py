@@ -0,0 +1,63 @@
+import numpy as np
+
+
+class BodyState(object):
+    '''
+    Where the Picrawler is: the foot coordinates of the 4 legs, (4, 3), and
+    the 12 angles last commanded to the servos, (12,), both float arrays
+    updated in place.
+
+    copy() does not copy the arrays, the copy shares them until one side
+    writes through set_coords / set_leg / set_angles, which first gives it
+    its own arrays. Shared arrays are read-only, so writing to them directly
+    raises instead of changing the other state too.
+    '''
+    __slots__ = ('coords', 'angles', 'owned')
+
+    def __init__(self, coords=None, angles=None):
+        self.coords = np.zeros((4, 3))
+        self.angles = np.zeros(12)
+        self.owned = True
+        if coords is not None:
+            self.coords[:] = coords
+        if angles is not None:
+            self.angles[:] = angles
+
+    def copy(self):
+        state = BodyState.__new__(BodyState)
+        state.coords = self.coords
+        state.angles = self.angles
+        state.owned = False
+        self.owned = False
+        self.coords.flags.writeable = False
+        self.angles.flags.writeable = False
+        return state
+
+    def own(self):
+        # own arrays before writing
+        if not self.owned:
+            self.coords = self.coords.copy()
+            self.angles = self.angles.copy()
+            self.owned = True
+
+    def set_coords(self, coords):
+        self.own()
+        self.coords[:] = coords
+
+    def set_leg(self, leg, coord):
+        self.own()
+        self.coords[leg] = coord
+
+    def set_angles(self, angles):
+        self.own()
+        self.angles[:] = angles
+
+    def leg(self, leg):
+        return self.coords[leg].tolist()
+
+    def legs(self):
+        # the coords as new nested lists, nothing shared with the state
+        return self.coords.tolist()
+
+    def __repr__(self):
+        return 'BodyState(%s, %s)'%(self.coords.tolist(), self.angles.tolist())
@@ -0,0 +1,61 @@
+import numpy as np
+import time
+
+
+class Telemetry(object):
+    '''
+    Ring buffer of the last `size` frames sent to the servos.
+
+    Each record holds the wall clock time, the foot coordinates (current_coord
+    after the frame), the 12 commanded angles, the speed and a bit mask of the
+    legs limit_angle had to clamp (bit 0 = leg 0 ...). The buffer is allocated
+    once, recording only writes into it, so memory stays constant however
+    long the robot runs.
+    '''
+    DTYPE = np.dtype([
+        ('time', '<f8'),
+        ('coords', '<f4', (4, 3)),
+        ('angles', '<f4', (12,)),
+        ('speed', '<f4'),
+        ('limit', 'u1'),
+    ])
+
+    def __init__(self, size=2048):
+        self.size = size
+        self.buffer = np.zeros(size, dtype=self.DTYPE)
+        # field views, so record() does not look the fields up every frame
+        self._time = self.buffer['time']
+        self._coords = self.buffer['coords']
+        self._angles = self.buffer['angles']
+        self._speed = self.buffer['speed']
+        self._limit = self.buffer['limit']
+        self.clear()
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+
+    def record(self, coords, angles, speed, limit=0):
+        i = self.index
+        self._time[i] = time.time()
+        self._coords[i] = coords
+        self._angles[i] = angles
+        self._speed[i] = speed
+        self._limit[i] = limit
+        self.index = i + 1 if i + 1 < self.size else 0
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def history(self):
+        '''
+        return: copy of the recorded frames, oldest first
+        '''
+        if self.count < self.size:
+            return self.buffer[:self.count].copy()
+        return np.concatenate((self.buffer[self.index:], self.buffer[:self.index]))
+
+    def dump(self, path):
+        # np.load(path) gives the same structured array as history()
+        np.save(path, self.history())
@@ -0,0 +1,107 @@
+'''
+Trajectories between sparse keyframes, sampled at a fixed control rate.
+
+profiles:
+    linear       - straight lines, constant speed inside each segment
+    minimum_jerk - 10s^3 - 15s^4 + 6s^5, starts and stops at rest on every
+                   keyframe, the smoothest point to point move
+    cubic        - cubic Hermite (Catmull-Rom) spline through all keyframes,
+                   velocity is continuous so the legs do not stop on the
+                   inner keyframes, at rest on the first and last one
+'''
+import numpy as np
+
+from .kinematics import A, B, C, coord2polar_batch, polar2coord_batch, limit_angle_batch
+
+PROFILES = ('linear', 'minimum_jerk', 'cubic')
+SPACES = ('joint', 'cartesian')
+
+
+def _segment_samples(durations, rate):
+    # number of control ticks per segment, at least one
+    return [max(1, int(round(d * rate))) for d in durations]
+
+
+def _durations(duration, segments):
+    durations = np.broadcast_to(np.asarray(duration, dtype=float), (segments,))
+    if (durations <= 0).any():
+        raise ValueError('Segment durations must be positive.')
+    return durations
+
+
+def _tangents(points, times):
+    # Catmull-Rom tangents for non uniform keyframe times, zero at both ends
+    tangents = np.zeros_like(points)
+    if len(points) > 2:
+        tangents[1:-1] = (points[2:] - points[:-2]) / (times[2:] - times[:-2]).reshape((-1,) + (1,) * (points.ndim - 1))
+    return tangents
+
+
+def interpolate(keyframes, duration, rate=50, profile='minimum_jerk'):
+    '''
+    keyframes: array-like, shape (K, ...), any per frame shape
+    duration:  seconds per segment, a number or K-1 numbers
+    rate:      control rate in Hz
+    return:    ndarray (M, ...) of setpoints, one per 1/rate seconds, the
+               first keyframe is not included (it is where the robot is),
+               the last setpoint is exactly the last keyframe
+    '''
+    if profile not in PROFILES:
+        raise ValueError('Unknown profile %s, use one of %s'%(profile, PROFILES))
+    points = np.asarray(keyframes, dtype=float)
+    if len(points) < 2:
+        return points[1:].copy()
+    durations = _durations(duration, len(points) - 1)
+    counts = _segment_samples(durations, rate)
+    shape = (-1,) + (1,) * (points.ndim - 1)
+
+    if profile == 'cubic':
+        times = np.concatenate(([0], np.cumsum(durations)))
+        tangents = _tangents(points, times)
+
+    out = np.empty((sum(counts),) + points.shape[1:])
+    start = 0
+    for k, n in enumerate(counts):
+        s = (np.arange(1, n + 1) / n).reshape(shape)
+        p0, p1 = points[k], points[k+1]
+        if profile == 'linear':
+            out[start:start+n] = p0 + (p1 - p0) * s
+        elif profile == 'minimum_jerk':
+            out[start:start+n] = p0 + (p1 - p0) * (s**3 * (10 - 15*s + 6*s**2))
+        else:
+            d = durations[k]
+            h00 = 2*s**3 - 3*s**2 + 1
+            h10 = s**3 - 2*s**2 + s
+            h01 = -2*s**3 + 3*s**2
+            h11 = s**3 - s**2
+            out[start:start+n] = h00*p0 + h10*d*tangents[k] + h01*p1 + h11*d*tangents[k+1]
+        start += n
+    return out
+
+
+def plan(keyframes, duration, rate=50, profile='minimum_jerk', space='joint', a=A, b=B, c=C):
+    '''
+    Servo setpoints for a sequence of steps (foot coordinates).
+
+    keyframes: array-like, shape (K, 4, 3), steps as passed to do_step
+    space:     'joint' solves the keyframes and interpolates the angles,
+               'cartesian' interpolates the feet and solves every setpoint,
+               feet move in straight lines / smooth curves
+    return:    (angles, coords), angles (M, 12) ready for servo_write_all,
+               already limited like set_angle, coords (M, 4, 3) the foot
+               positions along the way
+    '''
+    if space not in SPACES:
+        raise ValueError('Unknown space %s, use one of %s'%(space, SPACES))
+    keyframes = np.asarray(keyframes, dtype=float)
+    if space == 'joint':
+        _, angles = limit_angle_batch(coord2polar_batch(keyframes, a, b, c))
+        angles = interpolate(angles, duration, rate, profile)
+        coords = polar2coord_batch(angles, a, b, c)
+    else:
+        coords = interpolate(keyframes, duration, rate, profile)
+        flags, angles = limit_angle_batch(coord2polar_batch(coords, a, b, c))
+        # legs that hit the limits end up where the limited angles put them
+        if flags.any():
+            coords = np.where(flags[..., np.newaxis], polar2coord_batch(angles, a, b, c), coords)
+    return angles, coords
@@ -0,0 +1,80 @@
+'''
+Transitions from wherever the feet are into a gait, instead of starting
+the gait at frame 0 (or behind a full stand sequence).
+
+A foot can go straight to its place in a frame when it only slides a
+little on the ground, or when it is in the air now or in the frame (the
+whole body going up or down is not in the air). Any other foot has to be
+lifted, carried and put down, one at a time.
+nearest_frame picks the frame of a gait cheapest to reach, counting lifted
+feet, plan gives the frames that get there.
+'''
+import numpy as np
+
+# mm a foot may slide on the ground, the MoveList gaits slide up to
+# X_TURN - X_DEFAULT = 25 mm when sitting or standing up
+TOLERANCE = 30
+# mm above the lowest foot of a frame a foot counts as in the air
+AIR = 10
+# cost of lifting a foot, in mm of travel
+LIFT_COST = 100
+
+
+def lifted(coords, frames, tolerance=TOLERANCE):
+    # (N, 4), the feet of coords (4, 3) that have to be lifted to reach frames (N, 4, 3)
+    coords = np.asarray(coords, dtype=float)
+    frames = np.asarray(frames, dtype=float)
+    slide = np.linalg.norm(frames[..., :2] - coords[:, :2], axis=-1)
+    return (slide > tolerance) & ~in_air(coords) & ~in_air(frames)
+
+
+def in_air(frames):
+    # (..., 4) feet clearly above the lowest foot of their frame
+    z = frames[..., 2]
+    return z > z.min(axis=-1, keepdims=True) + AIR
+
+
+def nearest_frame(coords, frames, tolerance=TOLERANCE):
+    '''
+    return: index of the frame of frames (N, 4, 3) cheapest to reach from
+            coords (4, 3), the first one on a tie
+    '''
+    frames = np.asarray(frames, dtype=float)
+    d = np.linalg.norm(frames - np.asarray(coords, dtype=float), axis=-1)
+    cost = (d + LIFT_COST * lifted(coords, frames, tolerance)).sum(axis=1)
+    return int(np.argmin(cost))
+
+
+def plan(coords, target, lift=20, tolerance=TOLERANCE):
+    '''
+    Frames from coords to target, both (4, 3), the last one is target.
+    Empty when no foot has to be lifted, the target frame itself is the
+    move then.
+
+    return: ndarray (K, 4, 3)
+    '''
+    current = np.array(coords, dtype=float)
+    target = np.asarray(target, dtype=float)
+    carry = lifted(current, target[np.newaxis], tolerance)[0]
+    if not carry.any():
+        return np.empty((0, 4, 3))
+    frames = []
+    # feet sliding or landing first, feet going up last so the carried
+    # ones are moved with the most feet on the ground
+    down = ~carry & ~in_air(target)
+    if (current[down] != target[down]).any():
+        current[down] = target[down]
+        frames.append(current.copy())
+    d = np.linalg.norm(target - current, axis=-1)
+    for leg in np.argsort(-d):
+        if not carry[leg]:
+            continue
+        current[leg, 2] = max(current[leg, 2], target[leg, 2]) + lift
+        frames.append(current.copy())
+        current[leg, :2] = target[leg, :2]
+        frames.append(current.copy())
+        current[leg] = target[leg]
+        frames.append(current.copy())
+    if (frames[-1] != target).any():
+        frames.append(target.copy())
+    return np.array(frames)